@@ -1,15 +1,35 @@
 import cv2
-import mediapipe as mp
+import numpy as np
+import os
 import time
 import json
+import queue
 import tkinter as tk
 from threading import Thread
+from types import SimpleNamespace
 from tkinter import messagebox
 from PIL import Image, ImageTk
-
-# Initialize MediaPipe Pose
-mp_drawing = mp.solutions.drawing_utils
-mp_pose = mp.solutions.pose
+from frame_grabber import FrameGrabber
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, save_calibration_file uses json instead
+    orjson = None
+
+# MediaPipe is imported only when a pose detector is created, and numba
+# only when the inference thread compiles reduce_landmarks: both take
+# seconds to load, and the instructions page doesn't need them.
+
+# Skeleton edges as (start, end) landmark index pairs, for draw_pose
+# (the same pairs as mediapipe.solutions.pose.POSE_CONNECTIONS)
+POSE_CONNECTION_PAIRS = np.array([
+    (0, 1), (0, 4), (1, 2), (2, 3), (3, 7), (4, 5), (5, 6), (6, 8), (9, 10),
+    (11, 12), (11, 13), (11, 23), (12, 14), (12, 24), (13, 15), (14, 16),
+    (15, 17), (15, 19), (15, 21), (16, 18), (16, 20), (16, 22), (17, 19),
+    (18, 20), (23, 24), (23, 25), (24, 26), (25, 27), (26, 28), (27, 29),
+    (27, 31), (28, 30), (28, 32), (29, 31), (30, 32)
+], dtype=np.intp)
+DRAW_VISIBILITY_THRESHOLD = 0.5
 
 POSES = [
     {"name": "T-Pose", "instruction": "Stand tall with your arms extended horizontally (like a T)."},
@@ -33,24 +53,267 @@ FULL_BODY_VISIBLE_THRESHOLD = 0.9
 FULL_BODY_HOLD_TIME = 2
 COUNTDOWN_TIME = 10
 OUTPUT_FILE = "calibration_data.json"
+# With --checkpoint, each captured pose is appended here as one JSON line
+CHECKPOINT_FILE = OUTPUT_FILE + ".jsonl"
+UI_REFRESH_MS = 16  # Tk-side redraw cadence (~60 Hz)
+
+# Run pose inference on one of every N frames; the rest reuse the last result
+INFER_EVERY = 2
+INFER_EVERY_COUNTDOWN = 5
+PREVIEW_SIZE = (640, 480)  # (width, height) of the calibration preview
+
+# Pose models per model_complexity (0 = lite, 1 = full).
+# MediaPipe Tasks models are used for GPU inference (see README). If the file is
+# missing we fall back to the legacy CPU-only mp.solutions.pose.Pose solution.
+POSE_LANDMARKER_MODELS = {
+    0: "pose_landmarker_lite.task",
+    1: "pose_landmarker_full.task",
+    2: "pose_landmarker_heavy.task"
+}
+# BlazePose landmark models converted to ONNX (see onnx_pose_detector.py),
+# used for CPU/CUDA inference through onnxruntime when the Tasks model is absent.
+POSE_ONNX_MODELS = {
+    0: "pose_landmark_lite.onnx",
+    1: "pose_landmark_full.onnx",
+    2: "pose_landmark_heavy.onnx"
+}
+
+
+class TaskPoseDetector:
+    """Wraps the MediaPipe Tasks PoseLandmarker behind the same
+    process()/close() interface as mp.solutions.pose.Pose, so the camera loop
+    does not care which backend is running."""
+
+    def __init__(self, model_path, delegate, static_image_mode=False):
+        import mediapipe as mp
+        from mediapipe.tasks import python as mp_python
+        from mediapipe.tasks.python import vision
+        from mediapipe.framework.formats import landmark_pb2
+
+        self._mp = mp
+        self._landmark_pb2 = landmark_pb2
+        self._static = static_image_mode
+        base = mp_python.BaseOptions(model_asset_path=model_path, delegate=delegate)
+        opts = vision.PoseLandmarkerOptions(
+            base_options=base,
+            # IMAGE mode detects from scratch on every call, VIDEO mode tracks
+            running_mode=vision.RunningMode.IMAGE if static_image_mode else vision.RunningMode.VIDEO,
+            num_poses=1,
+            min_pose_detection_confidence=0.5,
+            min_tracking_confidence=0.5
+        )
+        self._landmarker = vision.PoseLandmarker.create_from_options(opts)
+        self._last_timestamp_ms = -1
+
+    def process(self, rgb_frame):
+        mp_image = self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=rgb_frame)
+
+        if self._static:
+            result = self._landmarker.detect(mp_image)
+        else:
+            # VIDEO mode requires strictly increasing timestamps
+            timestamp_ms = max(int(time.monotonic() * 1000), self._last_timestamp_ms + 1)
+            self._last_timestamp_ms = timestamp_ms
+            result = self._landmarker.detect_for_video(mp_image, timestamp_ms)
+
+        # Convert to the legacy proto so drawing_utils and .landmark keep working
+        pose_landmarks = None
+        if result.pose_landmarks:
+            pose_landmarks = self._landmark_pb2.NormalizedLandmarkList()
+            pose_landmarks.landmark.extend(
+                self._landmark_pb2.NormalizedLandmark(
+                    x=lm.x, y=lm.y, z=lm.z, visibility=lm.visibility or 0.0
+                )
+                for lm in result.pose_landmarks[0]
+            )
+        return SimpleNamespace(pose_landmarks=pose_landmarks)
+
+    def close(self):
+        self._landmarker.close()
+
+
+def put_latest(q, item):
+    """Put item into a 1-slot queue, dropping the stale item if it is full."""
+    while True:
+        try:
+            q.put_nowait(item)
+            return
+        except queue.Full:
+            # Another producer may refill the slot between these two calls
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
+
+
+def landmarks_to_array(pose_landmarks):
+    """Pack landmarks into a (N, 4) float32 array of x, y, z, visibility."""
+    landmarks = pose_landmarks.landmark
+    return np.fromiter(
+        (v for lm in landmarks for v in (lm.x, lm.y, lm.z, lm.visibility)),
+        dtype=np.float32,
+        count=len(landmarks) * 4
+    ).reshape(-1, 4)
+
+
+def _reduce_landmarks_numpy(arr):
+    """Return (mean visibility, min y, max y) of a landmark array."""
+    ys = arr[:, 1]
+    return float(arr[:, 3].mean()), float(ys.min()), float(ys.max())
+
+
+def _reduce_landmarks_loop(arr):
+    """Return (mean visibility, min y, max y) in one fused pass (compiled by numba)."""
+    vsum = 0.0
+    ymin = arr[0, 1]
+    ymax = arr[0, 1]
+    for i in range(arr.shape[0]):
+        vsum += arr[i, 3]
+        y = arr[i, 1]
+        if y < ymin:
+            ymin = y
+        if y > ymax:
+            ymax = y
+    return vsum / arr.shape[0], ymin, ymax
+
+
+# Replaced by the numba-compiled loop once compile_reduce_landmarks() has run
+reduce_landmarks = _reduce_landmarks_numpy
+
+
+def compile_reduce_landmarks():
+    """Switch reduce_landmarks to a numba-compiled version, if numba is installed."""
+    global reduce_landmarks
+    if reduce_landmarks is not _reduce_landmarks_numpy:
+        return  # already compiled
+    try:
+        from numba import njit
+    except ImportError:  # numba is optional, keep the NumPy version
+        return
+    compiled = njit(cache=True, fastmath=True)(_reduce_landmarks_loop)
+    # Compile now rather than on the first call from the Tk thread
+    compiled(np.zeros((len(POSE_LANDMARKS), 4), dtype=np.float32))
+    reduce_landmarks = compiled
+
+
+def landmark_array_to_json(arr):
+    """JSON hook: expand a (N, 4) landmark array into {name: {x, y, z, visibility}}."""
+    if not isinstance(arr, np.ndarray):
+        raise TypeError(f"Object of type {type(arr).__name__} is not JSON serializable")
+    return {
+        name: {"x": x, "y": y, "z": z, "visibility": v}
+        for name, (x, y, z, v) in zip(POSE_LANDMARKS, arr.tolist())
+    }
+
+
+def encode_calibration_json(data):
+    """Compact JSON bytes for calibration data, using orjson when available.
+
+    Pose entries are kept as landmark arrays and only expanded to named
+    dicts by the encoder.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=landmark_array_to_json)
+    return json.dumps(data, separators=(",", ":"), default=landmark_array_to_json).encode("utf-8")
+
+
+def save_calibration_file(path, data):
+    """Write calibration data as one compact JSON document."""
+    with open(path, "wb") as f:
+        f.write(encode_calibration_json(data))
+
+
+def append_calibration_checkpoint(path, pose_name, landmarks_arr):
+    """Append one captured pose as a JSON line, so each checkpoint writes
+    only the new pose instead of rewriting every pose so far."""
+    with open(path, "ab") as f:
+        f.write(encode_calibration_json({pose_name: landmarks_arr}) + b"\n")
+
+
+def draw_pose(rgb_frame, landmarks_arr):
+    """Draw the skeleton with one polylines call for the bones and one for the joints."""
+    height, width = rgb_frame.shape[:2]
+    points = (landmarks_arr[:, :2] * (width, height)).astype(np.int32)
+    visible = landmarks_arr[:, 3] >= DRAW_VISIBILITY_THRESHOLD
+
+    # Colors are (R, G, B): frames are drawn on after the RGB conversion
+    bones = POSE_CONNECTION_PAIRS[visible[POSE_CONNECTION_PAIRS].all(axis=1)]
+    cv2.polylines(rgb_frame, list(points[bones]), False, (255, 0, 0), 2)
+
+    # Zero-length thick segments render as round dots
+    joints = points[visible]
+    cv2.polylines(rgb_frame, list(np.stack([joints, joints], axis=1)), False, (0, 255, 0), 4)
+
+
+def create_pose_detector(model_complexity=1, static_image_mode=False):
+    """Prefer the Tasks PoseLandmarker on the GPU delegate, then on CPU,
+    then the ONNX landmark model, and finally the legacy mp.solutions.pose.Pose solution.
+
+    static_image_mode=True detects from scratch on every frame instead of
+    tracking, for one-off passes over a single frame."""
+    task_model = POSE_LANDMARKER_MODELS[model_complexity]
+    if os.path.exists(task_model):
+        from mediapipe.tasks import python as mp_python
+
+        Delegate = mp_python.BaseOptions.Delegate
+        for delegate in (Delegate.GPU, Delegate.CPU):
+            try:
+                return TaskPoseDetector(task_model, delegate, static_image_mode)
+            except Exception as e:
+                print(f"PoseLandmarker with {delegate.name} delegate unavailable: {e}")
+    onnx_model = POSE_ONNX_MODELS[model_complexity]
+    if os.path.exists(onnx_model):
+        try:
+            from onnx_pose_detector import OnnxPoseDetector
+            return OnnxPoseDetector(onnx_model, static_image_mode)
+        except Exception as e:
+            print(f"ONNX pose model unavailable: {e}")
+    import mediapipe as mp
+
+    # Calibration only needs the landmarks: no segmentation mask, and no
+    # temporal smoothing since the user is holding still anyway
+    return mp.solutions.pose.Pose(
+        model_complexity=model_complexity,
+        static_image_mode=static_image_mode,
+        enable_segmentation=False,
+        smooth_landmarks=False,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5
+    )
 
 
 class BodyCalibrationInstructions:
-    def __init__(self, root):
+    def __init__(self, root, checkpoint=False, heavy_final=False):
         self.root = root
+        # Also log each pose to CHECKPOINT_FILE as it is captured (crash recovery)
+        self.checkpoint = checkpoint
+        # Re-run each saved frame through the heavy model (slower start, more accurate)
+        self.heavy_final = heavy_final
         self.root.title("Ergo Scan Body Calibration")
         self.root.geometry("800x700")
         self.root.configure(bg="white")
 
         # Pose detection setup
         self.cap = None
-        self.pose_detector = mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5)
+        # Created lazily by load_pose_detectors
+        self.pose_detector_lite = None
+        self.pose_detector_full = None
+        self.pose_detector_final = None
         self.running = False
         self.current_pose_index = 0
         self.visible_start_time = None
         self.countdown_start_time = None
         self.calibration_data = {}
 
+        # Per-pose instruction strings, built once instead of every frame
+        self.idle_texts = [
+            f"Position yourself for {p['name']}:\n{p['instruction']}\nEnsure your full body is visible."
+            for p in POSES
+        ]
+        self.hold_texts = [f"Hold still for {p['name']}:\n{p['instruction']}" for p in POSES]
+        self.prepare_texts = [f"Prepare for {p['name']}:\n{p['instruction']}" for p in POSES]
+        self.displayed_text = {}  # StringVar name -> last text set
+
         # Start with instruction page
         self.show_instructions_page()
 
@@ -113,6 +376,9 @@ class BodyCalibrationInstructions:
     def show_calibration_page(self):
         self.clear_window()
 
+        # Load the pose models only once the user actually gets to calibration
+        self.load_pose_detectors()
+
         self.title_label = tk.Label(
             self.root,
             text="Ergo Scan Body Calibration",
@@ -127,6 +393,9 @@ class BodyCalibrationInstructions:
         self.video_label = tk.Label(self.root, bg="black")
         self.video_label.pack(pady=10)
 
+        # One Tk image reused for every preview frame
+        self.video_image = ImageTk.PhotoImage("RGB", PREVIEW_SIZE)
+
         self.instruction_text = tk.StringVar()
         self.instruction_label = tk.Label(
             self.root,
@@ -161,125 +430,247 @@ class BodyCalibrationInstructions:
         )
         self.start_button.pack(pady=20)
 
+    def load_pose_detectors(self):
+        # Lite model while looking for the user, full model for the countdown
+        # whose last frame is saved
+        if self.pose_detector_lite is None:
+            self.pose_detector_lite = create_pose_detector(model_complexity=0)
+        if self.pose_detector_full is None:
+            self.pose_detector_full = create_pose_detector(model_complexity=1)
+        if self.heavy_final and self.pose_detector_final is None:
+            self.pose_detector_final = create_pose_detector(model_complexity=2, static_image_mode=True)
+
     def start_calibration(self):
         self.start_button.config(state=tk.DISABLED)
+        self.load_pose_detectors()
         self.running = True
-        self.instruction_text.set("Position yourself so your entire body (head to toe) is visible.")
+        self.update_text(self.instruction_text, "Position yourself so your entire body (head to toe) is visible.")
+        self.video_label.configure(image=self.video_image)
+        if self.checkpoint:
+            open(CHECKPOINT_FILE, "wb").close()  # start a fresh log for this run
+
+        # capture -> inference -> Tk, each stage keeps only the newest item.
+        # Frames that skip inference reach Tk through their own slot, so a
+        # preview frame can never replace a pose result waiting in result_queue.
+        self.inference_queue = queue.Queue(maxsize=1)
+        self.result_queue = queue.Queue(maxsize=1)
+        self.preview_queue = queue.Queue(maxsize=1)
+        self.last_results = SimpleNamespace(pose_landmarks=None)
+        self.force_inference = False
         Thread(target=self.run_camera, daemon=True).start()
+        Thread(target=self.run_inference, daemon=True).start()
+        self.root.after(0, self.poll_results)
 
     # ---------------------------
-    # CAMERA LOOP
+    # CAMERA LOOP (capture thread)
     # ---------------------------
     def run_camera(self):
-        self.cap = cv2.VideoCapture(0)
+        # Ask the camera for the preview size directly so frames need no resize
+        self.cap = FrameGrabber(0).set_format(*PREVIEW_SIZE, fps=30).start()
         if not self.cap.isOpened():
-            self.instruction_text.set("Unable to access camera.")
+            # Tk is not thread-safe: hand the update to the UI thread
+            self.root.after(0, self.update_text, self.instruction_text, "Unable to access camera.")
+            self.running = False
             return
+        if self.cap.frame_size != PREVIEW_SIZE:
+            print(f"Camera delivers {self.cap.frame_size}, frames will be resized to {PREVIEW_SIZE}")
+
+        flipped = None  # reused mirror buffer, only touched by this thread
+        resized = np.empty((PREVIEW_SIZE[1], PREVIEW_SIZE[0], 3), dtype=np.uint8)
+        frame_index = 0
+        while self.running:
+            frame = self.cap.latest()
+            if frame is None:
+                continue
+
+            if flipped is None or flipped.shape != frame.shape:
+                flipped = np.empty_like(frame)
+            cv2.flip(frame, 1, dst=flipped)
+            mirrored = flipped
+            if mirrored.shape[:2] != resized.shape[:2]:
+                # Camera refused the requested size: shrink before anything else
+                # touches the pixels (INTER_AREA is the right filter for downscaling)
+                mirrored = cv2.resize(flipped, PREVIEW_SIZE, dst=resized, interpolation=cv2.INTER_AREA)
+
+            # Single BGR->RGB conversion: the RGB frame is used for inference,
+            # drawing and display. It gets a fresh array because it is handed
+            # to other threads while the next frame is being captured.
+            rgb_frame = cv2.cvtColor(mirrored, cv2.COLOR_BGR2RGB)
+
+            # Throttle inference; frames in between are shown with the last result.
+            # forced frames were captured after a countdown ended and must be inferred.
+            forced = self.force_inference
+            infer_every = INFER_EVERY if self.countdown_start_time is None else INFER_EVERY_COUNTDOWN
+            if forced or frame_index % infer_every == 0:
+                put_latest(self.inference_queue, (rgb_frame, forced))
+            else:
+                put_latest(self.preview_queue, rgb_frame)
+            frame_index += 1
 
-        while self.running and self.current_pose_index < len(POSES):
-            ret, frame = self.cap.read()
-            if not ret:
+        self.cap.release()
+
+    # ---------------------------
+    # INFERENCE LOOP (worker thread)
+    # ---------------------------
+    def run_inference(self):
+        pose_lite, pose_full = self.pose_detector_lite, self.pose_detector_full
+        pose_final = self.pose_detector_final
+        # Off the Tk thread, which uses the NumPy version until this is done
+        compile_reduce_landmarks()
+        while self.running:
+            try:
+                rgb_frame, forced = self.inference_queue.get(timeout=0.1)
+            except queue.Empty:
                 continue
 
-            frame = cv2.flip(frame, 1)
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.pose_detector.process(rgb_frame)
-
-            if results.pose_landmarks:
-                mp_drawing.draw_landmarks(
-                    frame,
-                    results.pose_landmarks,
-                    mp_pose.POSE_CONNECTIONS,
-                    mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
-                    mp_drawing.DrawingSpec(color=(0, 0, 255), thickness=2, circle_radius=2)
-                )
+            results = None
+            if forced and pose_final is not None:
+                # The frame that gets saved: one extra pass through the heavy model
+                results = pose_final.process(rgb_frame)
+            if results is None or not results.pose_landmarks:
+                detector = pose_lite if self.countdown_start_time is None else pose_full
+                results = detector.process(rgb_frame)
+            put_latest(self.result_queue, (rgb_frame, results, forced))
+
+        # Close the models here, once no process() call can be in flight
+        pose_lite.close()
+        pose_full.close()
+        if self.pose_detector_lite is pose_lite:
+            self.pose_detector_lite = None
+        if self.pose_detector_full is pose_full:
+            self.pose_detector_full = None
+        if pose_final is not None:
+            pose_final.close()
+            if self.pose_detector_final is pose_final:
+                self.pose_detector_final = None
 
-            img = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            img = cv2.resize(img, (640, 480))
-            imgtk = ImageTk.PhotoImage(image=Image.fromarray(img))
-            self.video_label.imgtk = imgtk
-            self.video_label.configure(image=imgtk)
-
-            # Visibility check
-            if results.pose_landmarks:
-                landmarks = results.pose_landmarks.landmark
-                avg_visibility = sum(lm.visibility for lm in landmarks) / len(landmarks)
-                ys = [lm.y for lm in landmarks]
-                full_body_in_frame = (min(ys) > 0 and max(ys) < 1)
-
-                if avg_visibility > FULL_BODY_VISIBLE_THRESHOLD and full_body_in_frame:
-                    if self.visible_start_time is None:
-                        self.visible_start_time = time.time()
-                    elif time.time() - self.visible_start_time >= FULL_BODY_HOLD_TIME:
-                        if self.countdown_start_time is None:
-                            self.countdown_start_time = time.time()
-                else:
-                    self.visible_start_time = None
-                    self.countdown_start_time = None
+    # ---------------------------
+    # RESULT HANDLING (Tk thread)
+    # ---------------------------
+    def poll_results(self):
+        if not self.running or not self.root.winfo_exists():
+            self.running = False
+            return
+
+        # Pose results first: they update last_results and the timers
+        try:
+            rgb_frame, results, forced = self.result_queue.get_nowait()
+        except queue.Empty:
+            try:
+                rgb_frame = self.preview_queue.get_nowait()
+            except queue.Empty:
+                pass
+            else:
+                self.handle_results(rgb_frame, None, False)
+        else:
+            self.handle_results(rgb_frame, results, forced)
+
+        if self.current_pose_index < len(POSES):
+            self.root.after(UI_REFRESH_MS, self.poll_results)
+        else:
+            self.finish_calibration()
+
+    def handle_results(self, rgb_frame, results, forced):
+        # One monotonic timestamp per frame: timers must not jump with the wall clock
+        now = time.monotonic()
+
+        # results is None for frames that skipped inference
+        if results is None:
+            results = self.last_results
+        else:
+            self.last_results = results
+
+        landmarks_arr = None
+        if results.pose_landmarks:
+            landmarks_arr = landmarks_to_array(results.pose_landmarks)
+
+            # The overlay isn't needed while the user holds still for the countdown
+            if self.countdown_start_time is None:
+                draw_pose(rgb_frame, landmarks_arr)
+
+        # Frames arrive at PREVIEW_SIZE (resized on the capture thread if needed)
+        self.video_image.paste(
+            Image.frombuffer("RGB", PREVIEW_SIZE, rgb_frame, "raw", "RGB", 0, 1)
+        )
+
+        # Visibility check
+        if landmarks_arr is not None:
+            avg_visibility, y_min, y_max = reduce_landmarks(landmarks_arr)
+            full_body_in_frame = (y_min > 0.0) and (y_max < 1.0)
+
+            if avg_visibility > FULL_BODY_VISIBLE_THRESHOLD and full_body_in_frame:
+                if self.visible_start_time is None:
+                    self.visible_start_time = now
+                elif now - self.visible_start_time >= FULL_BODY_HOLD_TIME:
+                    if self.countdown_start_time is None:
+                        self.countdown_start_time = now
             else:
                 self.visible_start_time = None
                 self.countdown_start_time = None
+        else:
+            self.visible_start_time = None
+            self.countdown_start_time = None
+
+        if self.countdown_start_time is None:
+            self.force_inference = False
+
+        # Countdown
+        if self.countdown_start_time:
+            elapsed = now - self.countdown_start_time
+            remaining = int(COUNTDOWN_TIME - elapsed)
+            if remaining > 0:
+                self.update_text(self.countdown_text, f"{remaining}s")
+                self.update_text(self.instruction_text, self.hold_texts[self.current_pose_index])
+            elif not forced:
+                # Countdown is over: wait for a frame captured from now on and
+                # inferred fresh, so the saved landmarks are up to date
+                self.force_inference = True
+            else:
+                self.force_inference = False
 
-            # Countdown
-            if self.countdown_start_time:
-                elapsed = time.time() - self.countdown_start_time
-                remaining = int(COUNTDOWN_TIME - elapsed)
-                if remaining > 0:
-                    self.countdown_text.set(f"{remaining}s")
-                    self.instruction_text.set(
-                        f"Hold still for {POSES[self.current_pose_index]['name']}:\n"
-                        f"{POSES[self.current_pose_index]['instruction']}"
+                # Save pose landmarks (names are attached when the file is written)
+                self.calibration_data[POSES[self.current_pose_index]['name']] = landmarks_arr
+                if self.checkpoint:
+                    append_calibration_checkpoint(
+                        CHECKPOINT_FILE, POSES[self.current_pose_index]['name'], landmarks_arr
                     )
-                else:
-                    # Save pose landmarks with names
-                    labeled_landmarks = {
-                        POSE_LANDMARKS[i]: {
-                            "x": lm.x,
-                            "y": lm.y,
-                            "z": lm.z,
-                            "visibility": lm.visibility
-                        }
-                        for i, lm in enumerate(results.pose_landmarks.landmark)
-                    }
-
-                    self.calibration_data[POSES[self.current_pose_index]['name']] = labeled_landmarks
-                    with open(OUTPUT_FILE, "w") as f:
-                        json.dump(self.calibration_data, f, indent=4)
-
-                    # Move to next pose
-                    self.current_pose_index += 1
-                    self.visible_start_time = None
-                    self.countdown_start_time = None
-                    self.countdown_text.set("")
-
-                    if self.current_pose_index < len(POSES):
-                        self.instruction_text.set(
-                            f"Prepare for {POSES[self.current_pose_index]['name']}:\n"
-                            f"{POSES[self.current_pose_index]['instruction']}"
-                        )
-                    continue
-
-            # Default instruction
-            if not self.countdown_start_time and self.current_pose_index < len(POSES):
-                self.instruction_text.set(
-                    f"Position yourself for {POSES[self.current_pose_index]['name']}:\n"
-                    f"{POSES[self.current_pose_index]['instruction']}\n"
-                    f"Ensure your full body is visible."
-                )
 
-            self.root.update()
+                # Move to next pose
+                self.current_pose_index += 1
+                self.visible_start_time = None
+                self.countdown_start_time = None
+                self.update_text(self.countdown_text, "")
+
+                if self.current_pose_index < len(POSES):
+                    self.update_text(self.instruction_text, self.prepare_texts[self.current_pose_index])
+                return
+
+        # Default instruction
+        if not self.countdown_start_time and self.current_pose_index < len(POSES):
+            self.update_text(self.instruction_text, self.idle_texts[self.current_pose_index])
 
-        # End calibration
+    def finish_calibration(self):
+        # Stops the capture and inference threads; the capture thread releases the camera
         self.running = False
-        if self.cap:
-            self.cap.release()
+
+        # All poses are kept in memory and written in one go
+        save_calibration_file(OUTPUT_FILE, self.calibration_data)
+        if self.checkpoint and os.path.exists(CHECKPOINT_FILE):
+            os.remove(CHECKPOINT_FILE)  # superseded by the complete file
 
         self.video_label.configure(image='')
-        self.instruction_text.set("Calibration complete! All poses captured.")
-        self.countdown_text.set("")
+        self.update_text(self.instruction_text, "Calibration complete! All poses captured.")
+        self.update_text(self.countdown_text, "")
         messagebox.showinfo("Calibration Done", f"Calibration complete. Data saved to {OUTPUT_FILE}.")
         self.start_button.config(state=tk.NORMAL)
 
+    def update_text(self, var, text):
+        # StringVar.set triggers a label relayout, so skip it when nothing changed
+        key = str(var)
+        if self.displayed_text.get(key) != text:
+            self.displayed_text[key] = text
+            var.set(text)
+
     def clear_window(self):
         for widget in self.root.winfo_children():
             widget.destroy()
@@ -287,6 +678,15 @@ class BodyCalibrationInstructions:
 
 # Run the Tkinter app
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ergo Scan body calibration")
+    parser.add_argument("--checkpoint", action="store_true",
+                        help=f"append each captured pose to {CHECKPOINT_FILE} as it happens")
+    parser.add_argument("--heavy-final", action="store_true",
+                        help="re-run each saved frame through the heavy pose model")
+    args = parser.parse_args()
+
     root = tk.Tk()
-    app = BodyCalibrationInstructions(root)
+    app = BodyCalibrationInstructions(root, checkpoint=args.checkpoint, heavy_final=args.heavy_final)
     root.mainloop()
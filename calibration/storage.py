@@ -9,33 +9,274 @@
 #  - File naming conventions
 #  - Safe JSON writing/loading
 #  - Validation checks
+#  - Converters between the per-joint and compact landmark layouts
+#  - A per-folder manifest for listing saved calibrations
+#  - Background and batch saves with one disk sync per batch
 #  - Example helper to bundle mock or real data and save it
 # -------------------------------------------------------------
 
+import base64
+import binascii
+import contextlib
 import json
+import logging
+import math
+import mmap
 import os
+import queue
+import sys
 import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass, fields
 from datetime import datetime, timezone
-from typing import Dict, Tuple, List, Optional, Any
+from typing import Dict, Tuple, List, Optional, Any, Iterator
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib json encoder
+    orjson = None
+
+try:
+    import jsonschema
+except ImportError:  # optional: validation falls back to the hand-written checks
+    jsonschema = None
+
+logger = logging.getLogger(__name__)
 
 # -------------------------------------------------------------
 # REQUIRED JSON STRUCTURE
 # -------------------------------------------------------------
 # These are the main keys expected in every calibration file.
 # If any are missing, the data fails validation.
-REQUIRED_TOP_LEVEL_KEYS = {
+REQUIRED_TOP_LEVEL_KEYS = frozenset({
     "version",
     "timestamp",
     "raw_landmarks",
     "measurements",
     "normalized",
     "camera_meta"
+})
+
+# raw_landmarks can be stored two ways (raw_landmarks.layout, default "aos"):
+#  - "aos": "landmarks" is a list of {"name", "x", "y", "z", "visibility"} dicts
+#  - "soa": "names" list plus base64 float32 arrays "xyz" (N x 3) and
+#           "visibility" (N), ~4x smaller and validated with numpy in one go
+_LANDMARK_LAYOUTS = ("aos", "soa")
+
+# Marks a key that is absent from a dict (None is a valid JSON value)
+_MISSING = object()
+
+# Measurement fields that must be numbers when present
+_NUMERIC_FIELDS = frozenset((
+    "pixel_height",
+    "scale_factor_cm_per_pixel",
+    "shoulder_width_px",
+    "shoulder_width_cm",
+    "arm_length_px",
+    "arm_length_cm",
+    "leg_length_px",
+    "leg_length_cm",
+    "torso_length_px",
+    "torso_length_cm",
+))
+
+# Keys of one landmark entry in the per-joint ("aos") layout
+_LANDMARK_KEYS = ("name", "x", "y", "z", "visibility")
+
+# -------------------------------------------------------------
+# TYPED RECORDS
+# -------------------------------------------------------------
+# Used by the hand-written validator: constructing one checks all its
+# field types at once. A failed check raises TypeError whose args are
+# the individual problems, e.g. ("x must be a number",).
+# (__slots__ via dataclass needs Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _is_number(value: Any) -> bool:
+    # bool is an int subclass, but JSON Schema (and JSON) treat true/false as non-numbers
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+@dataclass(frozen=True, **_SLOTS)
+class Landmark:
+    """One entry of raw_landmarks.landmarks."""
+    name: str
+    x: float
+    y: float
+    z: float
+    visibility: float
+
+    def __post_init__(self):
+        problems = []
+        if not isinstance(self.name, str):
+            problems.append("name must be a string")
+        if not _is_number(self.x):
+            problems.append("x must be a number")
+        if not _is_number(self.y):
+            problems.append("y must be a number")
+        if not _is_number(self.z):
+            problems.append("z must be a number")
+        if not _is_number(self.visibility):
+            problems.append("visibility must be a number")
+        if problems:
+            raise TypeError(*problems)
+
+
+@dataclass(frozen=True, **_SLOTS)
+class Measurements:
+    """The known numeric fields of "measurements"; any of them may be absent."""
+    pixel_height: Any = _MISSING
+    scale_factor_cm_per_pixel: Any = _MISSING
+    shoulder_width_px: Any = _MISSING
+    shoulder_width_cm: Any = _MISSING
+    arm_length_px: Any = _MISSING
+    arm_length_cm: Any = _MISSING
+    leg_length_px: Any = _MISSING
+    leg_length_cm: Any = _MISSING
+    torso_length_px: Any = _MISSING
+    torso_length_cm: Any = _MISSING
+
+    def __post_init__(self):
+        problems = [
+            f"{f.name} must be a number"
+            for f in fields(self)
+            if getattr(self, f.name) is not _MISSING and not _is_number(getattr(self, f.name))
+        ]
+        if problems:
+            raise TypeError(*problems)
+
+
+# -------------------------------------------------------------
+# COMPILED JSON SCHEMA
+# -------------------------------------------------------------
+# Same rules as the hand-written checks in _iter_check_errors,
+# expressed as JSON Schema (test_storage.py runs every validation test
+# through both). When jsonschema is installed the validator is built
+# once at import time and reused for every call.
+_NUMBER = {"type": "number"}
+
+_CAL_SCHEMA = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "type": "object",
+    "required": sorted(REQUIRED_TOP_LEVEL_KEYS),
+    "properties": {
+        "timestamp": {"type": "string", "format": "date-time"},
+        "raw_landmarks": {
+            "type": "object",
+            "properties": {"layout": {"enum": list(_LANDMARK_LAYOUTS)}},
+            "if": {"properties": {"layout": {"const": "soa"}}, "required": ["layout"]},
+            "then": {
+                "required": ["names", "xyz", "visibility"],
+                "properties": {
+                    "names": {"type": "array", "items": {"type": "string"}},
+                    "xyz": {"type": "string"},
+                    "visibility": {"type": "string"}
+                }
+            },
+            "else": {
+                "required": ["landmarks"],
+                "properties": {
+                    "landmarks": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "required": list(_LANDMARK_KEYS),
+                            "properties": {
+                                "name": {"type": "string"},
+                                "x": _NUMBER,
+                                "y": _NUMBER,
+                                "z": _NUMBER,
+                                "visibility": {"type": "number", "minimum": 0, "maximum": 1}
+                            }
+                        }
+                    }
+                }
+            }
+        },
+        "measurements": {
+            "type": "object",
+            "properties": {field: _NUMBER for field in sorted(_NUMERIC_FIELDS)}
+        },
+        "camera_meta": {"type": "object"}
+    }
 }
 
+def _is_iso_timestamp(ts: str) -> bool:
+    """True if ts parses with datetime.fromisoformat (one C call, no regex)."""
+    if sys.version_info < (3, 11) and ts.endswith("Z"):
+        ts = ts[:-1] + "+00:00"  # "Z" is only accepted natively from 3.11
+    try:
+        datetime.fromisoformat(ts)
+    except ValueError:
+        return False
+    return True
+
+
+if jsonschema is not None:
+    # The stock date-time check is a silent no-op unless an extra RFC 3339
+    # package is installed, so use fromisoformat for it
+    _FORMAT_CHECKER = jsonschema.FormatChecker()
+    _FORMAT_CHECKER.checks("date-time")(
+        lambda value: not isinstance(value, str) or _is_iso_timestamp(value)
+    )
+    _VALIDATOR = jsonschema.Draft202012Validator(_CAL_SCHEMA, format_checker=_FORMAT_CHECKER)
+else:
+    _VALIDATOR = None
+
+
+def _format_schema_error(err) -> str:
+    """Turn a jsonschema error into 'raw_landmarks.landmarks[3].x: <message>'."""
+    path = ""
+    for part in err.absolute_path:
+        if isinstance(part, int):
+            path += f"[{part}]"
+        else:
+            path += f".{part}" if path else part
+    return f"{path}: {err.message}" if path else err.message
+
+
+# -------------------------------------------------------------
+# BATCH TIMESTAMP
+# -------------------------------------------------------------
+# Inside `with batched_timestamp():` every helper below uses one pinned
+# UTC time instead of reading the clock (and formatting it) per save.
+_now_var: "ContextVar[Optional[datetime]]" = ContextVar("_now", default=None)
+
+
+def _now() -> datetime:
+    return _now_var.get() or datetime.now(timezone.utc)
+
+
+@contextlib.contextmanager
+def batched_timestamp():
+    """
+    Pin the current UTC time for a batch of saves.
+
+    Example:
+        with batched_timestamp():
+            for payload in payloads:
+                save_calibration_json(payload, filename=...)
+
+    Note: default_filename() only has one-second resolution, so batches
+    that rely on generated filenames need explicit names to stay unique.
+    """
+    token = _now_var.set(datetime.now(timezone.utc))
+    try:
+        yield
+    finally:
+        _now_var.reset(token)
+
+
 # -------------------------------------------------------------
 # FUNCTION: default_filename
 # -------------------------------------------------------------
-def default_filename(user_id: Optional[str] = None) -> str:
+def default_filename(user_id: Optional[str] = None, now: Optional[datetime] = None) -> str:
     """
     Generate a standard filename for a calibration file.
 
@@ -43,51 +284,168 @@ def default_filename(user_id: Optional[str] = None) -> str:
         "calibration_user-abc123_2025-10-30T22-00-00Z.json"
 
     - user_id is optional (if you don’t have a logged-in user yet)
-    - Uses current UTC time to keep filenames unique
+    - Uses current UTC time to keep filenames unique, or now if the
+      caller already read the clock
     """
-    ts = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H-%M-%SZ")
+    now = now or _now()
+    # Same as strftime("%Y-%m-%dT%H-%M-%SZ") without the locale-aware formatter
+    ts = (
+        f"{now.year:04d}-{now.month:02d}-{now.day:02d}"
+        f"T{now.hour:02d}-{now.minute:02d}-{now.second:02d}Z"
+    )
     user_tag = f"user-{user_id}" if user_id else "anon"
     return f"calibration_{user_tag}_{ts}.json"
 
 
+# -------------------------------------------------------------
+# HELPERS: encoding and syncing
+# -------------------------------------------------------------
+def _encode_json(data: Dict[str, Any], pretty: bool = False) -> bytes:
+    """
+    Encode data to UTF-8 JSON bytes (orjson if available).
+    Compact by default: these files are read by code, not people.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, option=option)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+# fdatasync skips the metadata flush (mtime etc.), which is all we need
+# for the file contents; not every platform has it.
+_datasync = getattr(os, "fdatasync", os.fsync)
+
+
+def _write_temp(dirpath: str, buf: bytes, durable: bool) -> str:
+    """Write buf to a new temp file in dirpath and return its path."""
+    fd, tmp_path = tempfile.mkstemp(dir=dirpath, prefix=".tmp_cal_", suffix=".json")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(buf)
+            f.flush()
+            if durable:
+                _datasync(f.fileno())  # ensure it's written to disk
+    except BaseException:
+        _remove_quietly(tmp_path)
+        raise
+    return tmp_path
+
+
+def _write_exclusive(path: str, buf: bytes, durable: bool) -> None:
+    """Create path (FileExistsError if it exists) and write buf straight into it."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(buf)
+            f.flush()
+            if durable:
+                _datasync(f.fileno())
+    except BaseException:
+        _remove_quietly(path)  # we created it, so no one else's file is lost
+        raise
+
+
+def _fsync_dir(dirpath: str) -> None:
+    """Flush a directory entry so a rename inside it survives a crash (POSIX only)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    dfd = os.open(dirpath, os.O_DIRECTORY)
+    try:
+        os.fsync(dfd)
+    finally:
+        os.close(dfd)
+
+
+def _sync_file(path: str) -> None:
+    """fdatasync a file that was written earlier without syncing."""
+    fd = os.open(path, os.O_RDWR)
+    try:
+        _datasync(fd)
+    finally:
+        os.close(fd)
+
+
+def _remove_quietly(path: str) -> None:
+    # One unlink instead of exists() + remove(); a missing file is the common case
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
 # -------------------------------------------------------------
 # FUNCTION: atomic_write_json
 # -------------------------------------------------------------
-def atomic_write_json(path: str, data: Dict[str, Any]) -> None:
+def atomic_write_json(
+    path: str,
+    data: Dict[str, Any],
+    durable: bool = False,
+    exclusive: bool = False,
+    pretty: bool = False,
+    dirpath: Optional[str] = None
+) -> None:
     """
     Safely writes JSON data to disk.
     Why “atomic”? Because it avoids corrupted files if your app
     crashes mid-write.
 
     FLOW:
-      1. Create a temp file in the same folder
-      2. Write data into that temp file
-      3. Replace the final file in one atomic operation
+      1. Encode the data to UTF-8 bytes in one go (orjson if available)
+      2. Create a temp file in the same folder and write it
+      3. Move it to the final path in one atomic operation
 
     This ensures we never end up with half-written JSONs.
+
+    durable=True also fdatasyncs the temp file before the rename and
+    fsyncs the folder after it, so the new file survives a power loss.
+    That costs far more than the write itself, so it is off by default;
+    without it the replace is still atomic, just not crash-proof yet.
+    save_calibration_json_batch() syncs a whole batch at once.
+
+    exclusive=True raises FileExistsError if path already exists. The
+    finished temp file is hard-linked to path (os.link fails atomically
+    if path exists) instead of renamed over it, so there is no window
+    between checking and writing, and path never exists half-written
+    or empty, not even after a crash. On filesystems without hard links
+    (FAT/exFAT drives, many SMB mounts) it falls back to creating path
+    with O_EXCL and writing into it directly, which keeps the check
+    atomic but can leave a partial file if the app crashes mid-write.
+
+    pretty=True writes indented JSON for humans; the default is compact.
+
+    dirpath is the folder that holds path; callers that already know it
+    pass it in so it isn't recomputed from path.
     """
-    dirpath = os.path.dirname(os.path.abspath(path)) or "."
-    fd, tmp_path = tempfile.mkstemp(dir=dirpath, prefix=".tmp_cal_", suffix=".json")
+    buf = _encode_json(data, pretty)
+    if dirpath is None:
+        dirpath = os.path.dirname(os.path.abspath(path)) or "."
+    tmp_path = _write_temp(dirpath, buf, durable)
     try:
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-            f.flush()
-            os.fsync(f.fileno())  # ensure it's written to disk
-        # Replace original file atomically
-        os.replace(tmp_path, path)
-    finally:
-        # Cleanup temp file in case of errors
-        if os.path.exists(tmp_path):
+        if exclusive:
+            # Publish the complete file under path unless path already exists
             try:
-                os.remove(tmp_path)
-            except Exception:
-                pass
+                os.link(tmp_path, path)
+            except FileExistsError:
+                raise
+            except OSError:
+                # No hard links on this filesystem (EPERM/ENOTSUP/...)
+                _write_exclusive(path, buf, durable)
+        else:
+            # Replace original file atomically
+            os.replace(tmp_path, path)
+    finally:
+        # Cleanup temp file (the link's second name, or left over after an error)
+        _remove_quietly(tmp_path)
+    if durable:
+        _fsync_dir(dirpath)
 
 
 # -------------------------------------------------------------
 # FUNCTION: validate_calibration_data
 # -------------------------------------------------------------
-def validate_calibration_data(data: Dict[str, Any]) -> Tuple[bool, List[str]]:
+def validate_calibration_data(data: Dict[str, Any], fast_fail: bool = False) -> Tuple[bool, List[str]]:
     """
     Check whether calibration data has all required fields and
     correct basic types.
@@ -102,97 +460,262 @@ def validate_calibration_data(data: Dict[str, Any]) -> Tuple[bool, List[str]]:
       4. Check sub-objects (raw_landmarks, measurements, etc.)
 
     Used before saving data to ensure structure integrity.
-    """
-    errors: List[str] = []
 
+    Uses the precompiled JSON Schema validator when jsonschema is
+    installed, otherwise the equivalent hand-written checks.
+
+    fast_fail=True stops at the first problem (the error list then has
+    at most one entry). Use it when only pass/fail matters.
+    """
     # Step 1: Basic type check
     if not isinstance(data, dict):
         return False, ["data must be a dictionary (parsed JSON object)"]
 
+    # Both checkers are generators, so fast_fail really stops the walk
+    checks = _iter_schema_errors(data) if _VALIDATOR is not None else _iter_check_errors(data)
+    if fast_fail:
+        first = next(checks, None)
+        errors = [] if first is None else [first]
+    else:
+        errors = list(checks)
+    return (len(errors) == 0), errors
+
+
+def _iter_schema_errors(data: Dict[str, Any]) -> Iterator[str]:
+    """Yield error messages from the compiled JSON Schema validator."""
+    failed = False
+    for err in _VALIDATOR.iter_errors(data):
+        failed = True
+        yield _format_schema_error(err)
+    if failed:
+        return
+
+    raw = data["raw_landmarks"]
+    if raw.get("layout") == "soa":
+        # The packed arrays are opaque to JSON Schema
+        yield from _iter_soa_errors(raw)
+    else:
+        # JSON Schema can't express "unique by name", so check it in one pass
+        seen_names = set()
+        for item in raw["landmarks"]:
+            name = item["name"]
+            seen_count = len(seen_names)
+            seen_names.add(name)
+            if len(seen_names) == seen_count:
+                yield f"duplicate landmark name: {name}"
+
+
+def _number_or_nan(value: Any) -> float:
+    return value if _is_number(value) else math.nan
+
+
+def _iter_check_errors(data: Dict[str, Any]) -> Iterator[str]:
+    """
+    Hand-written checks with the same rules as the JSON Schema, used
+    when jsonschema is not installed. Yields error messages.
+    """
+    dget = data.get  # looked up once for every top-level field below
+
     # Step 2: Check for missing keys
-    missing = REQUIRED_TOP_LEVEL_KEYS - set(data.keys())
+    missing = [k for k in REQUIRED_TOP_LEVEL_KEYS if k not in data]
     if missing:
-        errors.append(f"Missing top-level keys: {sorted(list(missing))}")
+        yield f"Missing top-level keys: {sorted(missing)}"
 
     # Step 3: Check timestamp
-    ts = data.get("timestamp")
+    ts = dget("timestamp")
     if ts is None:
-        errors.append("timestamp is required")
-    else:
-        if not isinstance(ts, str):
-            errors.append("timestamp must be an ISO string")
+        yield "timestamp is required"
+    elif not isinstance(ts, str):
+        yield "timestamp must be an ISO string"
+    elif not _is_iso_timestamp(ts):
+        yield "timestamp is not a valid ISO 8601 string"
 
-    # Step 4: Validate nested structures
+    # Step 4: Validate nested structures. A key that is present is checked
+    # even when its value is falsy ({}, [], ""), as the schema does;
+    # absent keys were already reported in step 2.
     # raw_landmarks should be a dict with a list of "landmarks"
-    raw = data.get("raw_landmarks")
-    if raw:
+    raw = dget("raw_landmarks", _MISSING)
+    if raw is not _MISSING:
         if not isinstance(raw, dict):
-            errors.append("raw_landmarks must be an object/dict")
+            yield "raw_landmarks must be an object/dict"
+        elif raw.get("layout", "aos") not in _LANDMARK_LAYOUTS:
+            yield f"raw_landmarks.layout must be one of {list(_LANDMARK_LAYOUTS)}"
+        elif raw.get("layout") == "soa":
+            yield from _iter_soa_errors(raw)
         else:
             lm = raw.get("landmarks")
             if lm is None:
-                errors.append("raw_landmarks.landmarks is required")
+                yield "raw_landmarks.landmarks is required"
             elif not isinstance(lm, list):
-                errors.append("raw_landmarks.landmarks must be a list (per-joint dicts)")
+                yield "raw_landmarks.landmarks must be a list (per-joint dicts)"
             else:
-                # Validate each landmark entry (required keys/types) and check for duplicate names
+                # Validate each landmark entry (required keys/types) and check for duplicate names.
+                # One .get per field; _MISSING marks a key that isn't there.
                 seen_names = set()
                 for i, item in enumerate(lm):
                     if not isinstance(item, dict):
-                        errors.append(f"raw_landmarks.landmarks[{i}] must be an object")
+                        yield f"raw_landmarks.landmarks[{i}] must be an object"
                         continue
+                    iget = item.get
+                    values = tuple(iget(key, _MISSING) for key in _LANDMARK_KEYS)
+
                     # required fields per item
-                    for key in ("name", "x", "y", "z", "visibility"):
-                        if key not in item:
-                            errors.append(f"raw_landmarks.landmarks[{i}] missing '{key}'")
-                    # types & ranges
-                    if "name" in item and not isinstance(item["name"], str):
-                        errors.append(f"raw_landmarks.landmarks[{i}].name must be a string")
-                    if "name" in item:
-                        if item["name"] in seen_names:
-                            errors.append(f"duplicate landmark name: {item['name']}")
-                        else:
-                            seen_names.add(item["name"])
-                    for coord in ("x", "y", "z"):
-                        if coord in item and not isinstance(item[coord], (int, float)):
-                            errors.append(f"raw_landmarks.landmarks[{i}].{coord} must be a number")
-                    if "visibility" in item:
-                        if not isinstance(item["visibility"], (int, float)):
-                            errors.append(f"raw_landmarks.landmarks[{i}].visibility must be a number")
-                        else:
-                            v = item["visibility"]
-                            if not (0.0 <= v <= 1.0):
-                                errors.append(f"raw_landmarks.landmarks[{i}].visibility must be between 0 and 1")
+                    missing_keys = [key for key, value in zip(_LANDMARK_KEYS, values) if value is _MISSING]
+                    if missing_keys:
+                        yield from (f"raw_landmarks.landmarks[{i}] missing '{key}'" for key in missing_keys)
+                        continue
+                    # types: Landmark checks them on construction
+                    try:
+                        landmark = Landmark(*values)
+                    except TypeError as e:
+                        yield from (f"raw_landmarks.landmarks[{i}].{problem}" for problem in e.args)
+                        continue
+                    seen_count = len(seen_names)
+                    seen_names.add(landmark.name)
+                    if len(seen_names) == seen_count:
+                        yield f"duplicate landmark name: {landmark.name}"
+
+                # Range check all visibilities in one numpy pass; entries that are
+                # missing or not numbers become NaN (already reported above)
+                vis = np.fromiter(
+                    (_number_or_nan(item.get("visibility")) if isinstance(item, dict) else math.nan for item in lm),
+                    dtype=np.float64,
+                    count=len(lm)
+                )
+                for i in np.flatnonzero((vis < 0.0) | (vis > 1.0)):
+                    yield f"raw_landmarks.landmarks[{i}].visibility must be between 0 and 1"
 
     # measurements must be a dict
-    meas = data.get("measurements")
-    if meas and not isinstance(meas, dict):
-        errors.append("measurements must be a dict")
+    meas = dget("measurements", _MISSING)
+    if meas is not _MISSING and not isinstance(meas, dict):
+        yield "measurements must be a dict"
     else:
         # If present, ensure known numeric measurement fields are numbers
         if isinstance(meas, dict):
-            numeric_fields = [
-                "pixel_height",
-                "scale_factor_cm_per_pixel",
-                "shoulder_width_px",
-                "shoulder_width_cm",
-                "arm_length_px",
-                "arm_length_cm",
-                "leg_length_px",
-                "leg_length_cm",
-                "torso_length_px",
-                "torso_length_cm",
-            ]
-            for f in numeric_fields:
-                if f in meas and not isinstance(meas[f], (int, float)):
-                    errors.append(f"measurements.{f} must be a number")
+            try:
+                Measurements(**{f: meas[f] for f in _NUMERIC_FIELDS & meas.keys()})
+            except TypeError as e:
+                yield from (f"measurements.{problem}" for problem in e.args)
 
     # camera_meta must be a dict
-    cam = data.get("camera_meta")
-    if cam and not isinstance(cam, dict):
-        errors.append("camera_meta must be a dict")
+    cam = dget("camera_meta", _MISSING)
+    if cam is not _MISSING and not isinstance(cam, dict):
+        yield "camera_meta must be a dict"
 
-    return (len(errors) == 0), errors
+
+# -------------------------------------------------------------
+# SOA LANDMARK LAYOUT
+# -------------------------------------------------------------
+def _encode_floats(values: np.ndarray) -> str:
+    return base64.b64encode(np.ascontiguousarray(values, dtype=np.float32).tobytes()).decode("ascii")
+
+
+def _decode_floats(text: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(text, validate=True), dtype=np.float32)
+
+
+def _iter_soa_errors(raw: Dict[str, Any]) -> Iterator[str]:
+    """Validate a "soa" raw_landmarks block with a few numpy ops; yields error messages."""
+    names = raw.get("names")
+    if not isinstance(names, list) or not all(isinstance(n, str) for n in names):
+        yield "raw_landmarks.names must be a list of strings"
+        return
+    try:
+        xyz = _decode_floats(raw["xyz"]).reshape(-1, 3)
+        vis = _decode_floats(raw["visibility"])
+    except KeyError as e:
+        yield f"raw_landmarks.{e.args[0]} is required"
+        return
+    except (TypeError, ValueError, binascii.Error):
+        yield "raw_landmarks.xyz and raw_landmarks.visibility must be base64 float32 arrays"
+        return
+
+    if not (xyz.shape[0] == vis.shape[0] == len(names)):
+        yield (
+            f"raw_landmarks arrays disagree in length: names={len(names)}, "
+            f"xyz={xyz.shape[0]}, visibility={vis.shape[0]}"
+        )
+    if not np.all((vis >= 0.0) & (vis <= 1.0)):
+        yield "raw_landmarks.visibility must be between 0 and 1"
+    if len(set(names)) != len(names):
+        yield "duplicate landmark names in raw_landmarks.names"
+
+
+def aos_to_soa(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return a copy of data with raw_landmarks in the compact "soa" layout.
+    Data that is already "soa" is returned unchanged.
+    """
+    raw = data["raw_landmarks"]
+    if raw.get("layout") == "soa":
+        return data
+    landmarks = raw["landmarks"]
+    arr = np.array(
+        [(lm["x"], lm["y"], lm["z"], lm["visibility"]) for lm in landmarks],
+        dtype=np.float32
+    ).reshape(-1, 4)
+
+    soa = {k: v for k, v in raw.items() if k != "landmarks"}
+    soa["layout"] = "soa"
+    soa["names"] = [lm["name"] for lm in landmarks]
+    soa["xyz"] = _encode_floats(arr[:, :3])
+    soa["visibility"] = _encode_floats(arr[:, 3])
+    return dict(data, raw_landmarks=soa)
+
+
+def soa_to_aos(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return a copy of data with raw_landmarks back in the per-joint dict
+    ("aos") layout. Data that is already "aos" is returned unchanged.
+    """
+    raw = data["raw_landmarks"]
+    if raw.get("layout") != "soa":
+        return data
+    xyz = _decode_floats(raw["xyz"]).reshape(-1, 3).tolist()
+    vis = _decode_floats(raw["visibility"]).tolist()
+
+    aos = {k: v for k, v in raw.items() if k not in ("layout", "names", "xyz", "visibility")}
+    aos["landmarks"] = [
+        {"name": name, "x": x, "y": y, "z": z, "visibility": v}
+        for name, (x, y, z), v in zip(raw["names"], xyz, vis)
+    ]
+    return dict(data, raw_landmarks=aos)
+
+
+def _with_defaults(data: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Copy data (never mutate the input) and fill in version/timestamp."""
+    data = dict(data)
+    data.setdefault("version", "1.0")
+    if "timestamp" not in data:
+        data["timestamp"] = (now or _now()).isoformat(timespec="seconds")
+    return data
+
+
+# Per-folder manifest: one JSON line per saved calibration, appended by
+# save_calibration_json, so listing calibrations never touches the
+# calibration files themselves. It is only a listing aid: by the time
+# it is updated the calibration is already saved, so failing to update
+# it is logged rather than raised (a retry would hit FileExistsError).
+INDEX_FILENAME = "_index.jsonl"
+
+
+def _append_index(folder_abs: str, entry: Dict[str, Any], durable: bool) -> None:
+    line = json.dumps(entry, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
+    fd = os.open(os.path.join(folder_abs, INDEX_FILENAME), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)  # a single small O_APPEND write lands as one line
+        if durable:
+            _datasync(fd)
+    finally:
+        os.close(fd)
+
+
+# Folders already created by save_calibration_json in this process,
+# so repeated saves to the same folder skip os.makedirs. Saves can come
+# from several threads (and the async writer), so changes take the lock;
+# the membership test on the fast path doesn't need it.
+_ensured_dirs = set()
+_ensured_dirs_lock = threading.Lock()
 
 
 # -------------------------------------------------------------
@@ -202,7 +725,10 @@ def save_calibration_json(
     data: Dict[str, Any],
     folder: str = "calibration/samples",
     filename: Optional[str] = None,
-    overwrite: bool = False
+    overwrite: bool = False,
+    validate: bool = True,
+    pretty: bool = False,
+    durable: bool = False
 ) -> str:
     """
     Validate and then save calibration JSON to disk.
@@ -212,6 +738,12 @@ def save_calibration_json(
       - folder: where to save (defaults to calibration/samples)
       - filename: optional custom name
       - overwrite: if False, prevents overwriting existing files
+      - validate: set to False only when data was just validated by the
+        caller (see save_calibration_json_batch); leave it on for anything
+        coming from outside the app
+      - pretty: write indented JSON instead of the compact default
+      - durable: sync the file and folder to disk before returning
+        (see atomic_write_json)
 
     Returns:
       - Absolute path to the saved JSON
@@ -223,31 +755,290 @@ def save_calibration_json(
       4. Build filename
       5. Use atomic_write_json() to safely save
     """
+    data, folder_abs, filename = _prepare_save(data, folder, filename, validate)
+    return _write_prepared(data, folder_abs, filename, overwrite, pretty, durable)
+
+
+def _prepare_save(
+    data: Dict[str, Any],
+    folder: str,
+    filename: Optional[str],
+    validate: bool,
+    now: Optional[datetime] = None
+) -> Tuple[Dict[str, Any], str, str]:
+    """Steps 1-4 of save_calibration_json; returns (data, folder_abs, filename)."""
+    # Read the clock once for both the timestamp and the filename
+    now = now or _now()
+
     # Ensure minimal metadata exists
-    data = dict(data)  # copy to avoid mutating input
-    data.setdefault("version", "1.0")
-    data.setdefault("timestamp", datetime.now(timezone.utc).isoformat())
+    data = _with_defaults(data, now)
 
     # Validate before saving
-    ok, errs = validate_calibration_data(data)
-    if not ok:
-        raise ValueError(f"Calibration data failed validation: {errs}")
+    if validate:
+        ok, errs = validate_calibration_data(data, fast_fail=True)
+        if not ok:
+            raise ValueError(f"Calibration data failed validation: {errs}")
 
-    # Ensure directory exists
-    os.makedirs(folder, exist_ok=True)
+    # Ensure directory exists (once per folder per process)
+    folder_abs = os.path.abspath(folder)
+    if folder_abs not in _ensured_dirs:
+        with _ensured_dirs_lock:
+            os.makedirs(folder_abs, exist_ok=True)
+            _ensured_dirs.add(folder_abs)
 
     # Build filename
     if filename is None:
-        filename = default_filename(data.get("user_id"))
-    path = os.path.join(folder, filename)
+        filename = default_filename(data.get("user_id"), now)
+    return data, folder_abs, filename
+
 
-    # Avoid overwriting unless explicitly allowed
-    if os.path.exists(path) and not overwrite:
-        raise FileExistsError(f"{path} already exists (use overwrite=True to replace)")
+def _write_prepared(
+    data: Dict[str, Any],
+    folder_abs: str,
+    filename: str,
+    overwrite: bool,
+    pretty: bool,
+    durable: bool
+) -> str:
+    """Step 5 of save_calibration_json plus the manifest entry; returns the path."""
+    path = os.path.join(folder_abs, filename)
 
-    # Write to disk safely
-    atomic_write_json(path, data)
-    return os.path.abspath(path)
+    # Write to disk safely; without overwrite the write itself refuses
+    # to replace an existing file
+    try:
+        atomic_write_json(path, data, durable=durable, exclusive=not overwrite, pretty=pretty, dirpath=folder_abs)
+    except FileExistsError:
+        raise FileExistsError(f"{path} already exists (use overwrite=True to replace)") from None
+    except FileNotFoundError:
+        # The folder was removed after we created it: forget it so the
+        # next save recreates it
+        with _ensured_dirs_lock:
+            _ensured_dirs.discard(folder_abs)
+        raise
+
+    # Record the save in the folder's manifest (see iter_calibrations)
+    try:
+        _append_index(folder_abs, {
+            "ts": data["timestamp"],
+            "user_id": data.get("user_id"),
+            "path": filename
+        }, durable)
+    except OSError as e:
+        logger.warning("Saved %s but could not add it to %s: %s", path, INDEX_FILENAME, e)
+    return path
+
+
+# -------------------------------------------------------------
+# FUNCTION: save_calibration_json_async
+# -------------------------------------------------------------
+# All async saves are written by one background thread. It takes up to
+# _ASYNC_BATCH_SIZE queued saves (waiting at most _ASYNC_BATCH_WINDOW
+# seconds for more to arrive), writes them without syncing, then syncs
+# the whole group at once: a group commit instead of one per file.
+_ASYNC_BATCH_SIZE = 32
+_ASYNC_BATCH_WINDOW = 0.02  # seconds
+
+_write_queue: "queue.Queue[tuple]" = queue.Queue()
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="calibration-writer")
+
+
+def save_calibration_json_async(
+    data: Dict[str, Any],
+    folder: str = "calibration/samples",
+    filename: Optional[str] = None,
+    overwrite: bool = False,
+    pretty: bool = False
+) -> Future:
+    """
+    Like save_calibration_json, but the write happens on the background
+    writer thread. Returns a Future that resolves to the absolute path
+    once the file is durably on disk (or to the write's exception).
+
+    Validation, defaults and the filename are still handled right away,
+    so invalid data raises ValueError here rather than in the Future.
+    Call flush() to wait for everything queued so far.
+    """
+    data, folder_abs, filename = _prepare_save(data, folder, filename, validate=True)
+    future: Future = Future()
+    _write_queue.put((data, folder_abs, filename, overwrite, pretty, future))
+    _writer.submit(_drain_write_queue)
+    return future
+
+
+def flush() -> None:
+    """Block until every save_calibration_json_async() call so far is on disk."""
+    # The writer runs tasks in order, so once this one runs all earlier batches are done
+    _writer.submit(_drain_write_queue).result()
+
+
+def _drain_write_queue() -> None:
+    try:
+        batch = [_write_queue.get_nowait()]
+    except queue.Empty:
+        return  # an earlier batch already picked these saves up
+    deadline = time.monotonic() + _ASYNC_BATCH_WINDOW
+    while len(batch) < _ASYNC_BATCH_SIZE:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(_write_queue.get(timeout=remaining))
+        except queue.Empty:
+            break
+
+    written = []
+    for data, folder_abs, filename, overwrite, pretty, future in batch:
+        if not future.set_running_or_notify_cancel():
+            continue
+        try:
+            path = _write_prepared(data, folder_abs, filename, overwrite, pretty, durable=False)
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            written.append((path, folder_abs, future))
+
+    # Group commit: sync the new files, then each folder's manifest and entry once
+    try:
+        _sync_saved([path for path, _, _ in written], {folder_abs for _, folder_abs, _ in written})
+    except Exception as e:
+        for _, _, future in written:
+            future.set_exception(e)
+        return
+    for path, _, future in written:
+        future.set_result(path)
+
+
+def _sync_saved(paths: List[str], folders) -> None:
+    """Sync files written with durable=False, then each folder's manifest and entries once."""
+    for path in paths:
+        _sync_file(path)
+    for folder_abs in folders:
+        index_path = os.path.join(folder_abs, INDEX_FILENAME)
+        try:
+            _sync_file(index_path)
+        except OSError as e:
+            # Missing or read-only manifest: _write_prepared already logged it
+            logger.warning("Could not sync %s: %s", index_path, e)
+        _fsync_dir(folder_abs)
+
+
+# -------------------------------------------------------------
+# FUNCTION: save_calibration_json_batch
+# -------------------------------------------------------------
+class BatchSaveError(Exception):
+    """
+    A batch save failed part-way through.
+
+    index is the position of the payload that failed (the original
+    error is chained as __cause__); saved lists the paths written
+    before it, which stay on disk, in the manifest, and synced.
+    """
+
+    def __init__(self, index: int, saved: List[str]):
+        super().__init__(f"Saving calibration data #{index} failed after {len(saved)} file(s) were saved")
+        self.index = index
+        self.saved = saved
+
+
+def save_calibration_json_batch(
+    payloads: List[Tuple[Dict[str, Any], Optional[str]]],
+    folder: str = "calibration/samples",
+    overwrite: bool = False,
+    pretty: bool = False
+) -> List[str]:
+    """
+    Validate many (data, filename) pairs, then save them and make them
+    durable together.
+
+    Every payload is validated exactly once, up front, so nothing is
+    written unless the whole batch is valid. The files are then written
+    without syncing and all synced in one pass at the end (the same
+    group commit the async writer uses), so a demo or test run that
+    writes hundreds of calibrations pays for one round of syncs instead
+    of one per file.
+
+    The clock is read once for the whole batch, so every filled-in
+    timestamp and generated filename agree. filename may be None to use
+    default_filename(); names generated more than once in the batch get
+    a "_1", "_2", ... suffix so they don't collide.
+
+    If a write fails (e.g. FileExistsError without overwrite), the files
+    already written are still synced and BatchSaveError reports them.
+
+    Returns the absolute paths in the same order as payloads.
+    """
+    now = _now()
+    checked = []
+    for index, (data, filename) in enumerate(payloads):
+        data = _with_defaults(data, now)
+        ok, errs = validate_calibration_data(data)
+        if not ok:
+            raise ValueError(f"Calibration data #{index} failed validation: {errs}")
+        checked.append((data, filename))
+
+    taken = {filename for _, filename in checked if filename is not None}
+    prepared = []
+    for data, filename in checked:
+        data, folder_abs, name = _prepare_save(data, folder, filename, validate=False, now=now)
+        if filename is None:
+            stem, ext = os.path.splitext(name)
+            suffix = 0
+            while name in taken:
+                suffix += 1
+                name = f"{stem}_{suffix}{ext}"
+        taken.add(name)
+        prepared.append((data, folder_abs, name))
+    folders = {folder_abs for _, folder_abs, _ in prepared}
+
+    paths: List[str] = []
+    for index, (data, folder_abs, filename) in enumerate(prepared):
+        try:
+            paths.append(_write_prepared(data, folder_abs, filename, overwrite, pretty, durable=False))
+        except Exception as e:
+            _sync_saved(paths, folders)
+            raise BatchSaveError(index, paths) from e
+    _sync_saved(paths, folders)
+    return paths
+
+
+# -------------------------------------------------------------
+# FUNCTION: iter_calibrations
+# -------------------------------------------------------------
+def iter_calibrations(folder: str = "calibration/samples", user_id: Optional[str] = None):
+    """
+    Yield {"ts", "user_id", "path"} for every calibration saved into
+    folder, oldest first, by reading the folder's _index.jsonl manifest
+    in one sequential pass. "path" is absolute.
+
+    - user_id: only yield calibrations saved for that user
+    - A file saved again with overwrite=True is listed once, at its
+      latest position
+    - Files removed by hand are still listed; files that were not
+      written by save_calibration_json are not, nor are saves whose
+      manifest update failed (logged as a warning)
+    """
+    folder_abs = os.path.abspath(folder)
+    try:
+        with open(os.path.join(folder_abs, INDEX_FILENAME), "rb") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return
+
+    latest: Dict[str, Dict[str, Any]] = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        latest.pop(entry["path"], None)  # re-insert so overwrites move to the end
+        latest[entry["path"]] = entry
+
+    for entry in latest.values():
+        if user_id is None or entry.get("user_id") == user_id:
+            yield dict(entry, path=os.path.join(folder_abs, entry["path"]))
+
+
+# Below this size a plain read() is cheaper than setting up a mapping
+_MMAP_MIN_SIZE = 64 * 1024
 
 
 # -------------------------------------------------------------
@@ -259,13 +1050,25 @@ def load_calibration_json(path: str) -> Dict[str, Any]:
 
     Returns a dictionary that you can use elsewhere in your app.
 
+    The file is read as bytes (no str decode step). Files of
+    _MMAP_MIN_SIZE bytes or more are memory-mapped and parsed straight
+    from the page cache instead of being copied into memory first.
+
     Raises:
       - FileNotFoundError if path doesn’t exist
       - json.JSONDecodeError if file is corrupted or not valid JSON
+        (orjson's error type is a subclass of it)
     """
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return data
+    loads = orjson.loads if orjson is not None else json.loads
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < _MMAP_MIN_SIZE:
+            return loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if orjson is None:
+                return loads(mm[:])  # stdlib json needs a bytes copy
+            # orjson parses the mapping directly through a memoryview
+            with memoryview(mm) as view:
+                return loads(view)
 
 
 # -------------------------------------------------------------
@@ -288,14 +1091,13 @@ def build_and_save_example(
 
     FLOW:
       1. Build a complete payload dictionary
-      2. Add defaults (version, timestamp)
-      3. Pass the payload to save_calibration_json()
+      2. Pass the payload to save_calibration_json(), which adds
+         the timestamp
     """
     payload = {
         "version": "1.0",
         "user_id": user_id,
         "pose_type": raw_landmarks.get("pose_type", "unknown"),
-        "timestamp": datetime.now(timezone.utc).isoformat(),
         "raw_landmarks": raw_landmarks,
         "measurements": measurements,
         "normalized": normalized,
@@ -0,0 +1,343 @@
+# calibration/test_storage.py
+"""
+Unit tests for storage.py (run with pytest).
+
+Validation runs through two checkers: the compiled JSON Schema when
+jsonschema is installed, and the hand-written _iter_check_errors
+otherwise. Validation tests run against both through the `checker`
+fixture, so the two can't drift apart.
+"""
+
+import errno
+import os
+from collections import OrderedDict
+
+import pytest
+
+import storage
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_payload(**overrides):
+    """A small valid calibration payload; keyword arguments replace top-level keys."""
+    payload = {
+        "version": "1.0",
+        "timestamp": "2025-10-30T22:00:00+00:00",
+        "user_id": "abc123",
+        "pose_type": "t_pose",
+        "raw_landmarks": {
+            "landmarks": [
+                {"name": "nose", "x": 0.5, "y": 0.1, "z": -0.2, "visibility": 0.99},
+                {"name": "left_shoulder", "x": 0.6, "y": 0.3, "z": -0.1, "visibility": 0.95}
+            ]
+        },
+        "measurements": {"pixel_height": 400.0, "shoulder_width_cm": 41.5},
+        "normalized": {},
+        "camera_meta": {"width": 640, "height": 480}
+    }
+    payload.update(overrides)
+    return payload
+
+
+@pytest.fixture(params=["schema", "fallback"])
+def checker(request, monkeypatch):
+    """Run the test once with each validator."""
+    if request.param == "schema":
+        if storage._VALIDATOR is None:
+            pytest.skip("jsonschema is not installed")
+    else:
+        monkeypatch.setattr(storage, "_VALIDATOR", None)
+    return request.param
+
+
+# -------------------------------------------------------------
+# validate_calibration_data
+# -------------------------------------------------------------
+def test_valid_payload_passes(checker):
+    assert storage.validate_calibration_data(make_payload()) == (True, [])
+
+
+def test_bad_measurements_and_camera_meta_are_reported(checker):
+    ok, errors = storage.validate_calibration_data(
+        make_payload(measurements={"pixel_height": "tall"}, camera_meta=[1])
+    )
+    assert not ok
+    assert any("pixel_height" in e for e in errors)
+    assert any("camera_meta" in e for e in errors)
+
+
+def test_dict_subclass_landmarks_are_accepted(checker):
+    payload = make_payload()
+    payload["raw_landmarks"]["landmarks"] = [OrderedDict(lm) for lm in payload["raw_landmarks"]["landmarks"]]
+    assert storage.validate_calibration_data(payload) == (True, [])
+
+
+@pytest.mark.parametrize("overrides, fragment", [
+    ({"raw_landmarks": {}}, "landmarks"),
+    ({"raw_landmarks": None}, "raw_landmarks"),
+    ({"measurements": []}, "measurements"),
+    ({"camera_meta": ""}, "camera_meta"),
+    ({"measurements": {"pixel_height": True}}, "pixel_height"),
+    ({"timestamp": "yesterday"}, "timestamp"),
+    ({"timestamp": 12}, "timestamp"),
+    ({"raw_landmarks": {"layout": "columns", "landmarks": []}}, "layout"),
+])
+def test_invalid_payloads_are_rejected(checker, overrides, fragment):
+    ok, errors = storage.validate_calibration_data(make_payload(**overrides))
+    assert not ok
+    assert any(fragment in e for e in errors), errors
+
+
+@pytest.mark.parametrize("landmark, fragment", [
+    ({"name": "nose", "x": True, "y": 0.1, "z": 0.0, "visibility": 0.5}, "x"),
+    ({"name": 3, "x": 0.5, "y": 0.1, "z": 0.0, "visibility": 0.5}, "name"),
+    ({"name": "nose", "x": 0.5, "y": 0.1, "z": 0.0, "visibility": 1.5}, "visibility"),
+    ({"name": "nose", "x": 0.5, "y": 0.1, "z": 0.0}, "visibility"),
+])
+def test_invalid_landmarks_are_rejected(checker, landmark, fragment):
+    ok, errors = storage.validate_calibration_data(make_payload(raw_landmarks={"landmarks": [landmark]}))
+    assert not ok
+    assert any(fragment in e for e in errors), errors
+
+
+def test_missing_keys_are_reported(checker):
+    payload = make_payload()
+    del payload["normalized"]
+    ok, errors = storage.validate_calibration_data(payload)
+    assert not ok
+    assert any("normalized" in e for e in errors)
+
+
+def test_duplicate_landmark_names_are_rejected(checker):
+    landmark = {"name": "nose", "x": 0.5, "y": 0.1, "z": 0.0, "visibility": 0.5}
+    ok, errors = storage.validate_calibration_data(make_payload(raw_landmarks={"landmarks": [landmark, landmark]}))
+    assert not ok
+    assert any("duplicate" in e for e in errors)
+
+
+def test_fast_fail_stops_at_the_first_error(checker):
+    payload = make_payload(timestamp="yesterday", measurements=[], camera_meta="")
+    assert len(storage.validate_calibration_data(payload)[1]) > 1
+    assert len(storage.validate_calibration_data(payload, fast_fail=True)[1]) == 1
+
+
+def test_non_dict_data_is_rejected(checker):
+    assert storage.validate_calibration_data([1, 2]) == (False, ["data must be a dictionary (parsed JSON object)"])
+
+
+def test_mock_calibration_file_is_valid(checker):
+    data = storage.load_calibration_json(os.path.join(REPO_ROOT, "data", "mock_calibration_data.json"))
+    assert storage.validate_calibration_data(data) == (True, [])
+
+
+# -------------------------------------------------------------
+# SOA LANDMARK LAYOUT
+# -------------------------------------------------------------
+def test_soa_round_trip(checker):
+    payload = make_payload()
+    soa = storage.aos_to_soa(payload)
+    assert soa["raw_landmarks"]["layout"] == "soa"
+    assert storage.validate_calibration_data(soa) == (True, [])
+    assert storage.aos_to_soa(soa) is soa
+
+    back = storage.soa_to_aos(soa)["raw_landmarks"]["landmarks"]
+    for original, restored in zip(payload["raw_landmarks"]["landmarks"], back):
+        assert restored["name"] == original["name"]
+        for key in ("x", "y", "z", "visibility"):
+            assert restored[key] == pytest.approx(original[key], abs=1e-6)
+
+
+def test_soa_length_mismatch_is_rejected(checker):
+    soa = storage.aos_to_soa(make_payload())
+    soa["raw_landmarks"]["names"].append("extra")
+    ok, errors = storage.validate_calibration_data(soa)
+    assert not ok
+    assert any("disagree" in e for e in errors)
+
+
+# -------------------------------------------------------------
+# SAVING AND LOADING
+# -------------------------------------------------------------
+def test_save_and_load_round_trip(tmp_path):
+    path = storage.save_calibration_json(make_payload(), folder=str(tmp_path), filename="a.json")
+    assert path == str(tmp_path / "a.json")
+    assert storage.load_calibration_json(path) == make_payload()
+    assert b"\n" not in (tmp_path / "a.json").read_bytes()  # compact by default
+
+
+def test_save_fills_in_defaults(tmp_path):
+    payload = make_payload()
+    del payload["timestamp"]
+    path = storage.save_calibration_json(payload, folder=str(tmp_path))
+    saved = storage.load_calibration_json(path)
+    assert storage._is_iso_timestamp(saved["timestamp"])
+    assert "timestamp" not in payload  # the input is not mutated
+    assert os.path.basename(path).startswith("calibration_user-abc123_")
+
+
+def test_save_rejects_invalid_data(tmp_path):
+    with pytest.raises(ValueError):
+        storage.save_calibration_json(make_payload(measurements=[]), folder=str(tmp_path))
+    assert not any(tmp_path.iterdir())
+
+
+def test_save_without_overwrite_keeps_the_existing_file(tmp_path):
+    path = storage.save_calibration_json(make_payload(user_id="first"), folder=str(tmp_path), filename="a.json")
+    with pytest.raises(FileExistsError):
+        storage.save_calibration_json(make_payload(user_id="second"), folder=str(tmp_path), filename="a.json")
+    assert storage.load_calibration_json(path)["user_id"] == "first"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["_index.jsonl", "a.json"]  # no temp files left
+
+    storage.save_calibration_json(make_payload(user_id="second"), folder=str(tmp_path), filename="a.json", overwrite=True)
+    assert storage.load_calibration_json(path)["user_id"] == "second"
+
+
+def test_durable_and_pretty_saves(tmp_path):
+    path = storage.save_calibration_json(
+        make_payload(), folder=str(tmp_path), filename="a.json", pretty=True, durable=True
+    )
+    assert b"\n  " in (tmp_path / "a.json").read_bytes()
+    assert storage.load_calibration_json(path) == make_payload()
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_load_large_file_through_mmap(tmp_path, monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(storage, "orjson", None)
+    elif storage.orjson is None:
+        pytest.skip("orjson is not installed")
+    payload = make_payload(normalized={"padding": "x" * storage._MMAP_MIN_SIZE})
+    path = storage.save_calibration_json(payload, folder=str(tmp_path), filename="big.json")
+    assert os.path.getsize(path) >= storage._MMAP_MIN_SIZE
+    assert storage.load_calibration_json(path) == payload
+
+
+def test_default_filename_and_batched_timestamp():
+    with storage.batched_timestamp():
+        first = storage.default_filename("abc")
+        assert storage.default_filename("abc") == first
+        now = storage._now()
+    assert first == now.strftime("calibration_user-abc_%Y-%m-%dT%H-%M-%SZ.json")
+    assert storage.default_filename().startswith("calibration_anon_")
+
+
+# -------------------------------------------------------------
+# MANIFEST
+# -------------------------------------------------------------
+def test_iter_calibrations_lists_saves_in_order(tmp_path):
+    folder = str(tmp_path)
+    storage.save_calibration_json(make_payload(user_id="a"), folder=folder, filename="1.json")
+    storage.save_calibration_json(make_payload(user_id="b"), folder=folder, filename="2.json")
+    storage.save_calibration_json(make_payload(user_id="a"), folder=folder, filename="1.json", overwrite=True)
+
+    entries = list(storage.iter_calibrations(folder))
+    assert [os.path.basename(e["path"]) for e in entries] == ["2.json", "1.json"]
+    assert all(os.path.isabs(e["path"]) for e in entries)
+    assert [e["user_id"] for e in storage.iter_calibrations(folder, user_id="a")] == ["a"]
+
+
+def test_iter_calibrations_on_missing_folder(tmp_path):
+    assert list(storage.iter_calibrations(str(tmp_path / "nope"))) == []
+
+
+def test_manifest_failure_does_not_fail_the_save(tmp_path, caplog):
+    (tmp_path / storage.INDEX_FILENAME).mkdir()  # appending to (and syncing) the manifest now fails
+    path = storage.save_calibration_json(make_payload(), folder=str(tmp_path), filename="a.json")
+    paths = storage.save_calibration_json_batch([(make_payload(), "b.json")], folder=str(tmp_path))
+    assert storage.load_calibration_json(path) == make_payload()
+    assert storage.load_calibration_json(paths[0]) == make_payload()
+    assert "could not add it to _index.jsonl" in caplog.text
+
+
+# -------------------------------------------------------------
+# BULK AND BACKGROUND SAVES
+# -------------------------------------------------------------
+def test_async_saves(tmp_path):
+    futures = [
+        storage.save_calibration_json_async(make_payload(), folder=str(tmp_path), filename=f"{i}.json")
+        for i in range(5)
+    ]
+    storage.flush()
+    paths = [f.result(timeout=5) for f in futures]
+    assert paths == [str(tmp_path / f"{i}.json") for i in range(5)]
+    assert len(list(storage.iter_calibrations(str(tmp_path)))) == 5
+
+
+def test_async_save_validates_immediately(tmp_path):
+    with pytest.raises(ValueError):
+        storage.save_calibration_json_async(make_payload(camera_meta=""), folder=str(tmp_path))
+
+
+def test_async_save_reports_write_errors(tmp_path):
+    storage.save_calibration_json(make_payload(), folder=str(tmp_path), filename="a.json")
+    future = storage.save_calibration_json_async(make_payload(), folder=str(tmp_path), filename="a.json")
+    with pytest.raises(FileExistsError):
+        future.result(timeout=5)
+
+
+def test_save_batch(tmp_path):
+    paths = storage.save_calibration_json_batch(
+        [(make_payload(), "a.json"), (make_payload(), "b.json")], folder=str(tmp_path)
+    )
+    assert paths == [str(tmp_path / "a.json"), str(tmp_path / "b.json")]
+    assert [e["path"] for e in storage.iter_calibrations(str(tmp_path))] == paths
+
+
+def test_save_batch_default_names_match_timestamps_and_are_unique(tmp_path):
+    payload = make_payload()
+    del payload["timestamp"]
+    paths = storage.save_calibration_json_batch([(payload, None), (payload, None)], folder=str(tmp_path))
+    saved = [storage.load_calibration_json(path) for path in paths]
+    assert saved[0]["timestamp"] == saved[1]["timestamp"]
+    name = storage.default_filename("abc123", storage.datetime.fromisoformat(saved[0]["timestamp"]))
+    assert [os.path.basename(path) for path in paths] == [name, name.replace(".json", "_1.json")]
+
+
+def test_save_batch_writes_nothing_if_one_is_invalid(tmp_path):
+    with pytest.raises(ValueError):
+        storage.save_calibration_json_batch(
+            [(make_payload(), "a.json"), (make_payload(measurements=[]), "b.json")], folder=str(tmp_path)
+        )
+    assert not any(tmp_path.iterdir())
+
+
+def test_save_batch_reports_files_saved_before_a_failure(tmp_path, monkeypatch):
+    storage.save_calibration_json(make_payload(), folder=str(tmp_path), filename="b.json")
+    synced = []
+    monkeypatch.setattr(storage, "_sync_file", synced.append)
+    with pytest.raises(storage.BatchSaveError) as excinfo:
+        storage.save_calibration_json_batch(
+            [(make_payload(), "c1.json"), (make_payload(), "b.json"), (make_payload(), "d.json")],
+            folder=str(tmp_path)
+        )
+    c1 = str(tmp_path / "c1.json")
+    assert excinfo.value.index == 1
+    assert excinfo.value.saved == [c1]
+    assert isinstance(excinfo.value.__cause__, FileExistsError)
+    assert c1 in synced
+    assert not (tmp_path / "d.json").exists()
+    assert c1 in [e["path"] for e in storage.iter_calibrations(str(tmp_path))]
+
+
+def test_exclusive_write_never_leaves_an_empty_file(tmp_path, monkeypatch):
+    def crash(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(storage, "_write_temp", crash)
+    with pytest.raises(OSError):
+        storage.atomic_write_json(str(tmp_path / "a.json"), make_payload(), exclusive=True)
+    assert not any(tmp_path.iterdir())
+
+
+def test_exclusive_write_without_hard_links(tmp_path, monkeypatch):
+    def no_links(src, dst):
+        raise OSError(errno.EPERM, "Operation not permitted")
+
+    monkeypatch.setattr(storage.os, "link", no_links)
+    path = storage.save_calibration_json(make_payload(user_id="first"), folder=str(tmp_path), filename="a.json")
+    assert storage.load_calibration_json(path)["user_id"] == "first"
+    with pytest.raises(FileExistsError):
+        storage.save_calibration_json(make_payload(user_id="second"), folder=str(tmp_path), filename="a.json")
+    assert storage.load_calibration_json(path)["user_id"] == "first"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["_index.jsonl", "a.json"]  # no temp files left
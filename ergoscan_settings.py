@@ -8,6 +8,11 @@ class ErgoScanSettings:
         self.root.geometry("900x500")
         self.root.configure(bg="#f8fafc")
         
+        # Widgets that change colour on hover, per grid row:
+        # row -> [(widget, option names to set), ...]
+        self._row_widgets = {}
+        self._row_colors = {}  # row -> background it currently has
+
         # Setting variables
         self.show_visual_feedback = tk.BooleanVar(value=True)
         self.audio_alert = tk.BooleanVar(value=False)
@@ -157,6 +162,15 @@ class ErgoScanSettings:
         )
         checkbox_label.pack(side=tk.LEFT, padx=(5, 0))
         
+        # Remember what the hover effect recolours, so it never has to search the grid
+        self._row_widgets[row] = [
+            (name_label, ("bg",)),
+            (purpose_label, ("bg",)),
+            (checkbox_frame, ("bg",)),
+            (checkbox, ("bg", "activebackground")),
+            (checkbox_label, ("bg",))
+        ]
+        
         # Bind hover effect
         name_label.bind("<Enter>", lambda e: self.on_row_enter(parent, row))
         purpose_label.bind("<Enter>", lambda e: self.on_row_enter(parent, row))
@@ -168,29 +182,21 @@ class ErgoScanSettings:
     
     def on_row_enter(self, parent, row):
         """Change background on hover"""
-        for widget in parent.grid_slaves(row=row):
-            if isinstance(widget, tk.Label):
-                widget.configure(bg="#f8fafc")
-            elif isinstance(widget, tk.Frame):
-                widget.configure(bg="#f8fafc")
-                for child in widget.winfo_children():
-                    if isinstance(child, (tk.Checkbutton, tk.Label)):
-                        child.configure(bg="#f8fafc")
-                        if isinstance(child, tk.Checkbutton):
-                            child.configure(activebackground="#f8fafc")
+        self.set_row_background(row, "#f8fafc")
     
     def on_row_leave(self, parent, row):
         """Restore background on leave"""
-        for widget in parent.grid_slaves(row=row):
-            if isinstance(widget, tk.Label):
-                widget.configure(bg="#ffffff")
-            elif isinstance(widget, tk.Frame):
-                widget.configure(bg="#ffffff")
-                for child in widget.winfo_children():
-                    if isinstance(child, (tk.Checkbutton, tk.Label)):
-                        child.configure(bg="#ffffff")
-                        if isinstance(child, tk.Checkbutton):
-                            child.configure(activebackground="#ffffff")
+        self.set_row_background(row, "#ffffff")
+    
+    def set_row_background(self, row, color):
+        """Recolour every widget of a setting row (one configure call per widget)"""
+        # Enter/Leave fire again when the pointer moves between widgets of
+        # the same row; skip the Tcl calls when nothing would change
+        if self._row_colors.get(row, "#ffffff") == color:
+            return
+        self._row_colors[row] = color
+        for widget, options in self._row_widgets[row]:
+            widget.configure(**{option: color for option in options})
     
     def update_status(self):
         """Update the status summary"""
@@ -0,0 +1,109 @@
+import sys
+import threading
+import time
+import cv2
+
+
+def default_backend():
+    """Capture backend with the least overhead on this platform.
+
+    V4L2 on Linux and DirectShow on Windows open faster than the generic
+    defaults and honour the MJPG/size requests in set_format().
+    """
+    if sys.platform.startswith("linux"):
+        return cv2.CAP_V4L2
+    if sys.platform == "win32":
+        return cv2.CAP_DSHOW
+    return cv2.CAP_ANY
+
+
+class FrameGrabber:
+    """Background webcam reader that always holds only the newest frame.
+
+    A daemon thread keeps calling cap.grab() so the driver queue never backs
+    up, and decodes each grabbed frame into a single slot. Consumers call
+    latest() and get the freshest frame without waiting on the camera.
+
+    min_interval (seconds) limits decoding for consumers that poll slower
+    than the camera delivers: frames grabbed sooner than that after the
+    last decoded one are dropped without cap.retrieve().
+    """
+
+    def __init__(self, src=0, backend=None, min_interval=0.0):
+        if backend is None:
+            backend = default_backend()
+        self.cap = cv2.VideoCapture(src, backend)
+        if not self.cap.isOpened() and backend != cv2.CAP_ANY:
+            # Backend not available in this OpenCV build: let OpenCV pick
+            self.cap = cv2.VideoCapture(src)
+        # Keep the driver-side queue as short as possible
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        self._lock = threading.Lock()
+        self._new_frame = threading.Event()
+        self._stopped = threading.Event()
+        self._frame = None
+        self._thread = None
+        self._min_interval = min_interval
+        self.frame_size = None
+
+    def set_format(self, width, height, fps=30, fourcc="MJPG"):
+        """Ask the driver for a capture format. Call before start().
+
+        The negotiated size is stored in self.frame_size as (width, height);
+        devices are free to ignore the request.
+        """
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.cap.set(cv2.CAP_PROP_FPS, fps)
+        self.frame_size = (
+            int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        )
+        return self
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def start(self):
+        """Start the grabber thread (no-op if the camera failed to open)."""
+        if self.cap.isOpened() and self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        last_decoded = float("-inf")
+        while not self._stopped.is_set():
+            if not self.cap.grab():
+                # Camera hiccup or unplugged, don't spin at 100% CPU
+                self._stopped.wait(0.01)
+                continue
+            now = time.monotonic()
+            if now - last_decoded < self._min_interval:
+                continue  # nobody will look at this one: skip the decode
+            last_decoded = now
+            ret, frame = self.cap.retrieve()
+            if not ret:
+                continue
+            with self._lock:
+                self._frame = frame  # overwrite: older frames are dropped
+                self._new_frame.set()
+
+    def latest(self, timeout=0.1):
+        """Return the newest unread BGR frame, or None if none arrived in time."""
+        if not self._new_frame.wait(timeout):
+            return None
+        with self._lock:
+            frame, self._frame = self._frame, None
+            self._new_frame.clear()
+        return frame
+
+    def release(self):
+        """Stop the grabber thread and release the camera."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.cap.release()
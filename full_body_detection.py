@@ -1,91 +1,139 @@
 # import libraries
 import mediapipe as mp
 import cv2
+import numpy as np
 from tkinter import *
 from tkinter import ttk
 import threading
+from frame_grabber import FrameGrabber
 
 
 # Init MediaPipe and OpenCV
 
+#Make sure OpenCV's SIMD-optimized code paths are on (some builds ship with them off)
+cv2.setUseOptimized(True)
+
+SCAN_SIZE = (640, 480) # (width, height) to capture at, plenty for pose detection
+
 #Init Mediapipe that combines pose, face, and hand landmarks into one Holistic model
 mp_drawing = mp.solutions.drawing_utils # A util for drawing landmarks and connections
 mp_holistic = mp.solutions.holistic # This var is used to visualize the landmarks and connections in the Mediapipe holistic model
 
+#Check for key presses without sleeping: pollKey (OpenCV 4.5.3+) returns immediately,
+#older builds fall back to the shortest possible waitKey
+poll_key = getattr(cv2, "pollKey", None) or (lambda: cv2.waitKey(1))
+
+#Drawing styles (landmark points, then connections), created once instead of every frame
+FACE_LANDMARK_SPEC = mp_drawing.DrawingSpec(color=(80, 110, 10), thickness=1, circle_radius=1)
+FACE_CONNECTION_SPEC = mp_drawing.DrawingSpec(color=(80, 256, 121), thickness=1, circle_radius=1)
+RIGHT_HAND_LANDMARK_SPEC = mp_drawing.DrawingSpec(color=(80, 22, 10), thickness=2, circle_radius=4)
+RIGHT_HAND_CONNECTION_SPEC = mp_drawing.DrawingSpec(color=(80, 44, 121), thickness=2, circle_radius=2)
+LEFT_HAND_LANDMARK_SPEC = mp_drawing.DrawingSpec(color=(121, 22, 76), thickness=2, circle_radius=4)
+LEFT_HAND_CONNECTION_SPEC = mp_drawing.DrawingSpec(color=(121, 44, 250), thickness=2, circle_radius=2)
+POSE_LANDMARK_SPEC = mp_drawing.DrawingSpec(color=(245, 117, 66), thickness=2, circle_radius=4)
+POSE_CONNECTION_SPEC = mp_drawing.DrawingSpec(color=(245, 66, 230), thickness=2, circle_radius=2)
+
 def start_scan():
     #Start video capture from the webcam (0 is default camera, 1 is external camera)
-    cap = cv2.VideoCapture(0) #if camera doesn't open, try changing to 0 or 1
+    #The grabber reads frames on its own thread, so the camera never waits on the
+    #model and the model always gets the newest frame (older ones are dropped)
+    #MJPG at 640x480 keeps driver-side conversion and per-frame copies small
+    cap = FrameGrabber(0).set_format(*SCAN_SIZE, fps=30).start() #if camera doesn't open, try changing to 0 or 1
 
     if not cap.isOpened():
         print("Error: Could not open webcam.")
         exit()
 
     #Init the mediapipe holistic model with minimum confidence thresholds
-    with mp_holistic.Holistic(min_detection_confidence =0.5, min_tracking_confidence=0.5) as holistic:
+    #Lite pose model (complexity 0) and no segmentation / iris refinement: neither is used here
+    with mp_holistic.Holistic(
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5,
+        model_complexity=0,
+        enable_segmentation=False,
+        refine_face_landmarks=False
+    ) as holistic:
+        #Conversion buffer, allocated once from the first frame and reused
+        rgb_buf = None
+
         #As long as the webcam is open, read frames from it
         while cap.isOpened():
-            ret, frame = cap.read() #Read current frame from webcam
+            #Press 'q' to exit the loop and close the application. Checked first so
+            #the window keeps handling events even while no frames arrive
+            if poll_key() & 0xFF == ord('q'):
+                break
+
+            frame = cap.latest() #Newest frame from the grabber thread
+            if frame is None:
+                continue
+
+            if rgb_buf is None or rgb_buf.shape != frame.shape:
+                rgb_buf = np.empty_like(frame)
 
             #Convert BGR (OpenCV format) to RGB (Mediapipe format)
-            image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            rgb_buf.flags.writeable = True
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_buf)
 
             #Process the frame using mediapipe holistic model to detect landmarks
-            results = holistic.process(image)
+            #(read-only lets MediaPipe use the buffer without copying it)
+            rgb_buf.flags.writeable = False
+            results = holistic.process(rgb_buf)
             #result = includes landmarks for face, pose, left and right hands
 
-            #Convert the RGB back to BGR for rendering
-            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+            #The landmarks are drawn straight onto the original BGR frame,
+            #so there is no conversion back from RGB
 
 
             #Visualize the detected landmarks on the frame
             #This renders the detected landmarks and connections on the live video feed for easy visualization.
             
-            # Draw face landmarks
-            mp_drawing.draw_landmarks(
-                image,
-                results.face_landmarks,
-                mp_holistic.FACEMESH_CONTOURS,
-                mp_drawing.DrawingSpec(color=(80, 110, 10), thickness=1, circle_radius=1),
-                mp_drawing.DrawingSpec(color=(80, 256, 121), thickness=1, circle_radius=1)
-            )
+            # Draw face landmarks (each part is None when it isn't in view)
+            if results.face_landmarks is not None:
+                mp_drawing.draw_landmarks(
+                    frame,
+                    results.face_landmarks,
+                    mp_holistic.FACEMESH_CONTOURS,
+                    FACE_LANDMARK_SPEC,
+                    FACE_CONNECTION_SPEC
+                )
 
             # Draw right hand landmarks
-            mp_drawing.draw_landmarks(
-                image,
-                results.right_hand_landmarks,
-                mp_holistic.HAND_CONNECTIONS,
-                mp_drawing.DrawingSpec(color=(80, 22, 10), thickness=2, circle_radius=4),
-                mp_drawing.DrawingSpec(color=(80, 44, 121), thickness=2, circle_radius=2)
-            )
+            if results.right_hand_landmarks is not None:
+                mp_drawing.draw_landmarks(
+                    frame,
+                    results.right_hand_landmarks,
+                    mp_holistic.HAND_CONNECTIONS,
+                    RIGHT_HAND_LANDMARK_SPEC,
+                    RIGHT_HAND_CONNECTION_SPEC
+                )
 
             # Draw left hand landmarks
-            mp_drawing.draw_landmarks(
-                image,
-                results.left_hand_landmarks,
-                mp_holistic.HAND_CONNECTIONS,
-                mp_drawing.DrawingSpec(color=(121, 22, 76), thickness=2, circle_radius=4),
-                mp_drawing.DrawingSpec(color=(121, 44, 250), thickness=2, circle_radius=2)
-            )
+            if results.left_hand_landmarks is not None:
+                mp_drawing.draw_landmarks(
+                    frame,
+                    results.left_hand_landmarks,
+                    mp_holistic.HAND_CONNECTIONS,
+                    LEFT_HAND_LANDMARK_SPEC,
+                    LEFT_HAND_CONNECTION_SPEC
+                )
 
             # Draw pose landmarks
-            mp_drawing.draw_landmarks(
-                image,
-                results.pose_landmarks,
-                mp_holistic.POSE_CONNECTIONS,
-                mp_drawing.DrawingSpec(color=(245, 117, 66), thickness=2, circle_radius=4),
-                mp_drawing.DrawingSpec(color=(245, 66, 230), thickness=2, circle_radius=2)
-            )
+            if results.pose_landmarks is not None:
+                mp_drawing.draw_landmarks(
+                    frame,
+                    results.pose_landmarks,
+                    mp_holistic.POSE_CONNECTIONS,
+                    POSE_LANDMARK_SPEC,
+                    POSE_CONNECTION_SPEC
+                )
 
             #Display the processed frame in a window
-            cv2.imshow('Full Body Detection', image)
-            #Press 'q' to exit the loop and close the application
-            if cv2.waitKey(10) & 0xFF == ord('q'):
-                break
+            cv2.imshow('Full Body Detection', frame)
 
 
     #Release resources: 
 
-    #Release webcam
+    #Stop the grabber thread and release webcam
     cap.release()
     #Close all OpenCV windows
     cv2.destroyAllWindows()
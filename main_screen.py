@@ -1,12 +1,34 @@
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import ttk, messagebox
+from concurrent.futures import ThreadPoolExecutor
+import time
 import cv2
+import numpy as np
 from PIL import Image, ImageTk
-from calibration import BodyCalibrationInstructions
 from ergoscan_settings import ErgoScanSettings
+from frame_grabber import FrameGrabber
+
+# The preview only does small resize/cvtColor calls; OpenCV's default of one
+# worker per core just competes with the Tk thread and the camera reader
+cv2.setNumThreads(2)
+
+PREVIEW_INTERVAL_MS = 30  # webcam preview refresh period
+WORKER_POLL_MS = 50  # how often the Tk thread checks on worker results
+PREVIEW_SIZE = (580, 430)  # (width, height) of the webcam preview image
+CAPTURE_SIZE = (640, 480)  # (width, height) requested from the camera
 
 
 class MainScreen:
+    # Body measurement form: (key, label, default value)
+    MEASUREMENT_FIELDS = [
+        ("shoulder_width", "Shoulder Width (cm):", "45"),
+        ("torso_length", "Torso Length (cm):", "60"),
+        ("hip_width", "Hip Width (cm):", "38"),
+        ("arm_length", "Arm Length (cm):", "65"),
+        ("leg_length", "Leg Length (cm):", "85")
+    ]
+
     # --- Initialize the main screen GUI ---
     def __init__(self, root):
         self.root = root
@@ -15,11 +37,23 @@ class MainScreen:
         self.root.configure(bg="#f0f0f0") #background color
         
         # Initialize webcam variables
-        self.cap = None
+        self.cap = None  # FrameGrabber: reads the camera on its own thread
+        # RGB preview pixels, rewritten in place every frame (only touched on the UI thread).
+        # Colour order: frames from the camera are BGR (OpenCV); this buffer and
+        # everything after it (PIL, the Tk image) is RGB.
+        self._rgb_buf = np.empty((PREVIEW_SIZE[1], PREVIEW_SIZE[0], 3), dtype=np.uint8)
+        self._tick_id = None  # the one pending preview update timer, if any
         # Start the app with camera OFF by default
         self.webcam_active = False
         self.start_button = tk.Button(self.root, text="Start", state="disabled")
         self.calibrated = False  #state variable to track if calibration has been done or not
+        self.form_vars = {}  # form field key -> StringVar holding its value
+
+        # Blocking work (opening the camera, saving) runs here, off the Tk thread.
+        # Workers never call into Tk (not even root.after): the Tk thread polls
+        # their futures with when_done and handles the results itself.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="main-screen")
+        self._closing = False  # set once the main window starts shutting down
         
         # Initialize profile data for name display
         self.profile_name = "John Doe"
@@ -29,6 +63,9 @@ class MainScreen:
 
     # --- Function that sets up the UI (split into left and right sections) ---
     def setup_ui(self):
+        self.setup_fonts()
+        self.setup_styles()
+
         # Configure the root layout grid and weight
         self.root.grid_columnconfigure(1, weight=1) #configure column 1 for form section
         self.root.grid_columnconfigure(2, weight=1) #configure column 2 for right section
@@ -58,22 +95,42 @@ class MainScreen:
         self.setup_right_section()
 
 
+    # --- Fonts shared by all widgets of the main screen ---
+    def setup_fonts(self):
+        # Font objects are resolved by Tk once; widgets then just refer to them
+        self._f_title = tkfont.Font(self.root, family="Arial", size=18, weight="bold")
+        self._f_heading = tkfont.Font(self.root, family="Arial", size=16, weight="bold")
+        self._f_subheading = tkfont.Font(self.root, family="Arial", size=14, weight="bold")
+        self._f_btn = tkfont.Font(self.root, family="Arial", size=12, weight="bold")
+        self._f_label = tkfont.Font(self.root, family="Arial", size=11, weight="bold")
+        self._f_small_bold = tkfont.Font(self.root, family="Arial", size=10, weight="bold")
+        self._f_icon = tkfont.Font(self.root, family="Arial", size=24)
+        self._f_large = tkfont.Font(self.root, family="Arial", size=16)
+        self._f_medium = tkfont.Font(self.root, family="Arial", size=14)
+        self._f_text = tkfont.Font(self.root, family="Arial", size=11)
+        self._f_small = tkfont.Font(self.root, family="Arial", size=10)
+
+    # --- ttk styles shared by the themed widgets ---
+    def setup_styles(self):
+        style = ttk.Style(self.root)
+        style.configure("Form.TLabel", background="#ffffff", font=self._f_label)
+
     # --- Setup icons section (profile and settings) ---
     def setup_icons_section(self):
         # Profile icon with name
         profile_frame = tk.Frame(self.icons_frame, bg="#f0f0f0")
         profile_frame.pack(pady=(0, 10), anchor="w")
         
-        profile_icon = tk.Button(profile_frame, text="👤", font=("Arial", 16), bg="#e0e0e0", 
+        profile_icon = tk.Button(profile_frame, text="👤", font=self._f_large, bg="#e0e0e0", 
                                  command=self.open_profile, relief="flat", width=3)
         profile_icon.pack(side="left")
         
-        profile_label = tk.Label(profile_frame, text=self.profile_name, font=("Arial", 10), 
+        profile_label = tk.Label(profile_frame, text=self.profile_name, font=self._f_small, 
                                  bg="#f0f0f0", fg="#333333")
         profile_label.pack(side="left", padx=(5, 0))
         
         # Settings icon
-        settings_icon = tk.Button(self.icons_frame, text="⚙", font=("Arial", 16), bg="#e0e0e0", 
+        settings_icon = tk.Button(self.icons_frame, text="⚙", font=self._f_large, bg="#e0e0e0", 
                                   command=self.show_settings, relief="flat", width=3)
         settings_icon.pack(pady=(0, 10), anchor="w")
 
@@ -91,7 +148,7 @@ class MainScreen:
         icons_frame.grid_propagate(False)
         
         # Settings icon button (top)
-        settings_button = tk.Button(icons_frame, text="⚙️", font=("Arial", 24),
+        settings_button = tk.Button(icons_frame, text="⚙️", font=self._f_icon,
             bg="#ffffff", bd=0, command=self.open_settings,
             cursor="hand2", width=2, height=1,
             activebackground="#ffffff", highlightthickness=0,
@@ -99,7 +156,7 @@ class MainScreen:
         settings_button.pack(pady=(10, 5))
         
         # Profile icon button (below settings)
-        profile_button = tk.Button(icons_frame, text="👤", font=("Arial", 24),
+        profile_button = tk.Button(icons_frame, text="👤", font=self._f_icon,
             bg="#ffffff", bd=0, command=self.open_profile,
             cursor="hand2", width=2, height=1,
             activebackground="#ffffff", highlightthickness=0,
@@ -114,7 +171,7 @@ class MainScreen:
         
         # Title
         title_label = tk.Label(content_frame, text="Body Measurements", 
-                              font=("Arial", 18, "bold"), bg="#ffffff")
+                              font=self._f_title, bg="#ffffff")
         title_label.grid(row=0, column=0, pady=(0, 10))
         
         # Form frame
@@ -123,32 +180,28 @@ class MainScreen:
         form_frame.grid_columnconfigure(1, weight=1)
         
         # Form fields with body measurements
-        fields = [
-            ("Shoulder Width (cm):", "45"),
-            ("Torso Length (cm):", "60"),
-            ("Hip Width (cm):", "38"),
-            ("Arm Length (cm):", "65"),
-            ("Leg Length (cm):", "85")
-        ]
-        
-        for i, (label_text, default_value) in enumerate(fields):
-            # Label
-            label = tk.Label(form_frame, text=label_text, font=("Arial", 11, "bold"), 
-                           bg="#ffffff", anchor="w")
-            label.grid(row=i, column=0, sticky="w", pady=5, padx=(0, 10))
-            
-            # Entry field
-            entry = tk.Entry(form_frame, font=("Arial", 10), relief="solid", bd=1)
-            entry.grid(row=i, column=1, sticky="ew", pady=5)
-            entry.insert(0, default_value)
+        next_row = self._build_form(form_frame, self.MEASUREMENT_FIELDS)
         
         # Submit button
         submit_button = tk.Button(form_frame, text="Save Measurements",
-                                font=("Arial", 12, "bold"), bg="#2196F3", fg="white",
+                                font=self._f_btn, bg="#2196F3", fg="white",
                                 width=20, height=2, command=self.save_form,
                                 relief="raised", bd=2, activebackground="#1976D2",
                                 activeforeground="white", highlightthickness=0)
-        submit_button.grid(row=len(fields), column=0, columnspan=2, pady=20)
+        submit_button.grid(row=next_row, column=0, columnspan=2, pady=20)
+
+    def _build_form(self, parent, fields):
+        """Grid one label + entry row per (key, label, default) field; returns the next free row"""
+        for i, (key, label_text, default_value) in enumerate(fields):
+            # Label
+            label = ttk.Label(parent, text=label_text, style="Form.TLabel", anchor="w")
+            label.grid(row=i, column=0, sticky="w", pady=5, padx=(0, 10))
+            
+            # Entry field, starting out with the default through its variable
+            self.form_vars[key] = tk.StringVar(value=default_value)
+            entry = ttk.Entry(parent, textvariable=self.form_vars[key], font=self._f_small)
+            entry.grid(row=i, column=1, sticky="ew", pady=5)
+        return len(fields)
 
     def open_profile(self):
         """Handle profile button click - allows changing profile name"""
@@ -171,19 +224,19 @@ class MainScreen:
         
         # Title
         title_label = tk.Label(main_frame, text="Edit Profile Name", 
-                              font=("Arial", 14, "bold"), bg="#ffffff")
+                              font=self._f_subheading, bg="#ffffff")
         title_label.pack(pady=(0, 15))
         
         # Name input frame
         input_frame = tk.Frame(main_frame, bg="#ffffff")
         input_frame.pack(fill=tk.X, pady=(0, 15))
         
-        tk.Label(input_frame, text="Name:", font=("Arial", 11), 
+        tk.Label(input_frame, text="Name:", font=self._f_text, 
                 bg="#ffffff").pack(side=tk.LEFT)
         
         name_var = tk.StringVar(value=self.profile_name)
         name_entry = tk.Entry(input_frame, textvariable=name_var, 
-                             font=("Arial", 11), width=20)
+                             font=self._f_text, width=20)
         name_entry.pack(side=tk.RIGHT)
         name_entry.focus_set()
         name_entry.select_range(0, tk.END)
@@ -207,13 +260,13 @@ class MainScreen:
         
         # Save button
         save_btn = tk.Button(buttons_frame, text="Save", command=save_profile,
-                            font=("Arial", 10, "bold"), bg="#2196F3", fg="white",
+                            font=self._f_small_bold, bg="#2196F3", fg="white",
                             width=8, relief="raised", bd=1)
         save_btn.pack(side=tk.LEFT, padx=(0, 10))
         
         # Cancel button
         cancel_btn = tk.Button(buttons_frame, text="Cancel", command=cancel_profile,
-                              font=("Arial", 10), bg="#f44336", fg="white",
+                              font=self._f_small, bg="#f44336", fg="white",
                               width=8, relief="raised", bd=1)
         cancel_btn.pack(side=tk.LEFT)
         
@@ -252,13 +305,44 @@ class MainScreen:
     def save_form(self):
         """Handle form save"""
         print("Saving information...")
+        # Read the fields here (Tk thread), save on the worker
+        values = {key: var.get() for key, var in self.form_vars.items()}
+        self.when_done(self._executor.submit(self.save_measurements, values), self.on_form_saved)
+
+    def when_done(self, future, callback):
+        """Call callback(future) on the Tk thread once a worker future has finished"""
+        if future.done():
+            callback(future)
+        else:
+            self.root.after(WORKER_POLL_MS, self.when_done, future, callback)
+
+    def save_measurements(self, values):
+        """Persist the form values (runs on the worker thread, must not touch Tk)"""
         # TODO: Implement actual data saving logic
-        tk.messagebox.showinfo("Success", "Information saved successfully!")
+        return values
+
+    def on_form_saved(self, future):
+        """Report the save result (back on the Tk thread)"""
+        if future.exception() is not None:
+            tk.messagebox.showerror("Error", f"Could not save information: {future.exception()}")
+        else:
+            tk.messagebox.showinfo("Success", "Information saved successfully!")
 
     def on_closing(self):
         """Handle window closing"""
+        # Stop the preview loop and cancel its pending tick
+        self._closing = True
+        self.webcam_active = False
+        if self._tick_id is not None:
+            self.root.after_cancel(self._tick_id)
+            self._tick_id = None
+        # Don't wait for the worker: a camera open can take seconds. Queued work
+        # is skipped and an open in flight releases its own camera (see open_camera).
+        self._executor.shutdown(wait=False)
+        # Stop and join the frame reader thread, then release the webcam
         if self.cap:
             self.cap.release()
+            self.cap = None
         self.root.destroy()
 
         
@@ -274,7 +358,7 @@ class MainScreen:
         title_label = tk.Label( #Defines the title label details
             self.right_frame, 
             text="Webcam Preview", 
-            font=("Arial", 16, "bold"), 
+            font=self._f_heading, 
             bg="#ffffff"
         )
         title_label.grid( #Defines the grid placement of the title label
@@ -305,20 +389,20 @@ class MainScreen:
         self.webcam_frame.grid_propagate(False) #Disable automatic frame resizing
         
         # Webcam label for displaying video feed
-        # Create initial blank image to maintain consistent size
-        initial_blank = Image.new('RGB', (580, 430), color='black')
-        initial_photo = ImageTk.PhotoImage(initial_blank)
+        # One PhotoImage for the whole session: frames are pasted into it in place
+        # The blank image keeps the size consistent while the camera is off
+        self._blank_image = Image.new('RGB', PREVIEW_SIZE, color='black')
+        self._photo = ImageTk.PhotoImage(self._blank_image)
         
         self.webcam_label = tk.Label( #webcam label details
             self.webcam_frame, 
             bg="#000000",             
-            image=initial_photo,
+            image=self._photo,
             text="Toggle Camera ON to Start", 
             fg="white",
-            font=("Arial", 14),
+            font=self._f_medium,
             compound='center'  # Show text over image
         )
-        self.webcam_label.image = initial_photo  # Keep reference to prevent garbage collection
         self.webcam_label.pack(expand=True, fill="both") #Enable automatic resizing for the label
 
 
@@ -344,7 +428,7 @@ class MainScreen:
         self.calibration_button = tk.Button( #start calibration button details
             button_frame,
             text="Start Calibration",
-            font=("Arial", 14),
+            font=self._f_medium,
             bg="#2196F3",
             fg="white",
             width=20,
@@ -365,7 +449,7 @@ class MainScreen:
         self.start_button = tk.Button( #start scanning button details
             button_frame, 
             text="Start Scanning",
-            font=("Arial", 14), 
+            font=self._f_medium, 
             bg="#4CAF50", 
             fg="white",
             width=20, 
@@ -387,7 +471,10 @@ class MainScreen:
     def on_camera_toggle(self, state):
         if state:
             print("Camera ON")
-            self.start_webcam_preview()
+            # Opening the camera can block for a while: let Tk paint the
+            # switch and the message first, then open it once idle
+            self.webcam_label.config(text="Starting camera...", fg="white")
+            self.root.after_idle(self.start_webcam_preview)
         else:
             print("Camera OFF")
             self.stop_webcam()
@@ -395,57 +482,119 @@ class MainScreen:
 
     # --- Webcam Functions ---
     def start_webcam_preview(self):
+        # Opening the camera blocks, so it happens on the worker thread
+        self.when_done(self._executor.submit(self.open_camera), self.on_camera_opened)
+
+    def open_camera(self):
+        """Open and start the preview camera (runs on the worker thread, must not touch Tk)"""
+        if self._closing:
+            return None  # queued before the window closed: don't open the camera at all
+        # Frames are read on the grabber's thread; the UI only picks up the newest one.
+        # Only decode as often as the preview repaints, and ask for a size
+        # close to the preview so there is nothing to scale down.
+        cap = FrameGrabber(0, min_interval=PREVIEW_INTERVAL_MS / 1000)
+        cap.set_format(*CAPTURE_SIZE, fps=30).start()
+        if self._closing:
+            # The window closed while the camera was opening: nobody will release it
+            cap.release()
+            return None
+        return cap
+
+    def on_camera_opened(self, future):
+        """Start the preview with the camera opened by open_camera (back on the Tk thread)"""
         try:
-            self.cap = cv2.VideoCapture(0)
-            if self.cap.isOpened():
-                self.webcam_active = True
-                self.update_webcam()
-            else:
-                self.webcam_label.config(text="Camera not available", fg="red")
+            cap = future.result()
         except Exception as e:
             self.webcam_label.config(text=f"Camera error: {str(e)}", fg="red")
+            return
+        if cap is None:
+            return  # the window is closing
+        if self.webcam_active or not self.toggle_camera_switch.state:
+            # Switched off (or on again) while this camera was opening
+            cap.release()
+            return
+        if cap.isOpened():
+            self.cap = cap
+            self.webcam_active = True
+            self.webcam_label.config(text="")
+            update_webcam = self.make_webcam_updater()
+            update_webcam()
+        else:
+            cap.release()
+            self.webcam_label.config(text="Camera not available", fg="red")
             
-    def update_webcam(self):
-        if self.webcam_active and self.cap and self.cap.isOpened():
-            ret, frame = self.cap.read()
-            if ret:
-                # Resize frame to fit the display area
-                frame = cv2.resize(frame, (580, 430))
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    def make_webcam_updater(self):
+        """
+        Build the preview loop for the camera that was just opened.
+
+        Everything the loop touches each tick is bound to a local of this
+        closure once, so a tick does no attribute or global lookups beyond
+        the webcam_active check.
+        """
+        latest = self.cap.latest
+        cvt_color = cv2.cvtColor
+        resize = cv2.resize
+        frombuffer = Image.frombuffer
+        paste = self._photo.paste
+        after = self.root.after
+        monotonic = time.monotonic
+        rgb_buf = self._rgb_buf
+        bgr2rgb = cv2.COLOR_BGR2RGB
+        inter_area = cv2.INTER_AREA
+        preview_size = PREVIEW_SIZE
+        capture_shape = (CAPTURE_SIZE[1], CAPTURE_SIZE[0], 3)
+        # Centre crop of a CAPTURE_SIZE frame to PREVIEW_SIZE (a view, no copy or interpolation)
+        x = (CAPTURE_SIZE[0] - PREVIEW_SIZE[0]) // 2
+        y = (CAPTURE_SIZE[1] - PREVIEW_SIZE[1]) // 2
+        crop = (slice(y, y + PREVIEW_SIZE[1]), slice(x, x + PREVIEW_SIZE[0]))
+
+        def update_webcam():
+            self._tick_id = None
+            if not self.webcam_active:
+                return
+            tick_start = monotonic()
+            frame = latest(0)  # never wait for the camera on the UI thread
+            if frame is not None:
+                if frame.shape == capture_shape:
+                    # Camera honoured the request: show the centre of the frame
+                    frame = frame[crop]
+                else:
+                    # Resize frame to fit the display area
+                    frame = resize(frame, preview_size, interpolation=inter_area)
+                # The only full-frame pass on the usual path: read the BGR crop,
+                # write RGB straight into the preview buffer
+                cvt_color(frame, bgr2rgb, dst=rgb_buf)
                 
-                # Convert to PhotoImage
-                image = Image.fromarray(frame)
-                photo = ImageTk.PhotoImage(image)
+                # Update the label's image in place (frombuffer wraps the buffer
+                # without copying it; no new Tk image per frame)
+                paste(frombuffer('RGB', preview_size, rgb_buf, 'raw', 'RGB', 0, 1))
                 
-                # Update label
-                self.webcam_label.config(image=photo, text="")
-                self.webcam_label.image = photo
-                
-            # Schedule next update
-            self.root.after(30, self.update_webcam)
+            # Schedule next update, keeping a steady cadence whatever this tick cost
+            elapsed_ms = int((monotonic() - tick_start) * 1000)
+            self._tick_id = after(max(1, PREVIEW_INTERVAL_MS - elapsed_ms), update_webcam)
+
+        return update_webcam
 
     def stop_webcam(self):
         """Safely stop the webcam feed and release resources."""
         if self.webcam_active:
             self.webcam_active = False  # stop update loop
+        if self._tick_id is not None:
+            self.root.after_cancel(self._tick_id)
+            self._tick_id = None
 
         if hasattr(self, "cap") and self.cap and self.cap.isOpened():
             self.cap.release()
             self.cap = None
 
-        # Create a blank image with the same dimensions as the camera feed
-        blank_image = Image.new('RGB', (580, 430), color='black')
-        blank_photo = ImageTk.PhotoImage(blank_image)
-        
-        # Update label with blank image and overlay text
+        # Blank the preview and overlay text
+        self._photo.paste(self._blank_image)
         self.webcam_label.config(
-            image=blank_photo, 
             text="Camera OFF", 
             fg="white", 
             compound='center', 
-            font=("Arial", 16)
+            font=self._f_large
         )
-        self.webcam_label.image = blank_photo
 
         # Update toggle button color to red
         if hasattr(self, "toggle_camera_button"):
@@ -469,6 +618,10 @@ class MainScreen:
             print("Calibration window is already open")
             return
         
+        # Imported here: calibration pulls in MediaPipe, which is slow to load
+        # and not needed unless the user actually calibrates
+        from calibration import BodyCalibrationInstructions
+
         # Create a new window for calibration instructions
         self.calibration_window = tk.Toplevel(self.root)
         self.calibration_app = BodyCalibrationInstructions(self.calibration_window)
@@ -526,16 +679,6 @@ class MainScreen:
         if hasattr(self, 'settings_window'):
             self.settings_window.destroy()
 
-    def toggle_camera(self):
-        """Toggle camera on/off"""
-        if self.cap and self.cap.isOpened():
-            self.cap.release()
-            self.cap = None
-            print("Camera turned off")
-        else:
-            self.cap = cv2.VideoCapture(0)
-            print("Camera turned on")
-
 
     # --- Class for Webcam ON/OFF iOS toggle switch look ---
 class ToggleSwitch(tk.Frame):
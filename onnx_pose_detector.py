@@ -0,0 +1,159 @@
+"""BlazePose landmark model running on onnxruntime.
+
+The model is a pose_landmark_{lite,full,heavy}.tflite file shipped inside
+the mediapipe wheel, converted once with:
+
+    python -m tf2onnx.convert --tflite pose_landmark_full.tflite --output pose_landmark_full.onnx --opset 17
+
+OnnxPoseDetector exposes the same process()/close() interface as
+mp.solutions.pose.Pose. Only the landmark stage is run: the region of
+interest is tracked from the previous frame's landmarks, and when there
+is no previous pose (or every DETECT_EVERY frames, or always with
+static_image_mode=True) the whole frame is letterboxed into the model
+input instead of running a separate person detector. That is enough for
+calibration, where one person stands centered in front of the camera.
+"""
+
+from types import SimpleNamespace
+import cv2
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+
+INPUT_SIZE = 256
+NUM_LANDMARKS = 33      # the model outputs 39 points; the last 6 are auxiliary
+VALUES_PER_LANDMARK = 5  # x, y, z, visibility logit, presence logit
+POSE_FLAG_THRESHOLD = 0.5
+ROI_SCALE = 1.25
+DETECT_EVERY = 10
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _ends_in_sigmoid(model_path, output_name):
+    """
+    Whether output_name is computed by a Sigmoid node (looking through
+    Identity nodes), or None if the onnx package isn't installed.
+    """
+    try:
+        import onnx
+    except ImportError:
+        return None
+    graph = onnx.load(model_path, load_external_data=False).graph
+    producers = {name: node for node in graph.node for name in node.output}
+    node = producers.get(output_name)
+    while node is not None and node.op_type == "Identity":
+        node = producers.get(node.input[0])
+    return node is not None and node.op_type == "Sigmoid"
+
+
+class OnnxPoseDetector:
+    def __init__(self, model_path, static_image_mode=False, flag_is_logit=None):
+        import onnxruntime as ort
+
+        available = ort.get_available_providers()
+        providers = [p for p in ("CUDAExecutionProvider", "CPUExecutionProvider") if p in available]
+        self._session = ort.InferenceSession(model_path, providers=providers)
+
+        model_input = self._session.get_inputs()[0]
+        self._input_name = model_input.name
+        self._nchw = model_input.shape[1] == 3
+
+        # Pick outputs by shape: (1, 195) landmarks and (1, 1) pose flag
+        self._landmarks_name = None
+        self._flag_name = None
+        for out in self._session.get_outputs():
+            if len(out.shape) != 2:
+                continue  # segmentation mask / heatmap outputs are not used
+            if out.shape[-1] == 39 * VALUES_PER_LANDMARK:
+                self._landmarks_name = out.name
+            elif out.shape[-1] == 1 and self._flag_name is None:
+                self._flag_name = out.name
+        if self._landmarks_name is None:
+            raise ValueError(f"{model_path} does not look like a BlazePose landmark model")
+
+        # The BlazePose pose flag is a probability (the model ends in a
+        # sigmoid), but a conversion can drop that node and return the raw
+        # logit. Decide once, from the graph when the onnx package is
+        # available; pass flag_is_logit to override.
+        if flag_is_logit is None and self._flag_name is not None:
+            flag_is_logit = _ends_in_sigmoid(model_path, self._flag_name) is False
+        self._flag_is_logit = bool(flag_is_logit)
+
+        # Preallocated input/warp buffers (in the model's layout) and a reusable IO binding
+        self._warp_buf = np.empty((INPUT_SIZE, INPUT_SIZE, 3), dtype=np.uint8)
+        input_shape = (1, 3, INPUT_SIZE, INPUT_SIZE) if self._nchw else (1, INPUT_SIZE, INPUT_SIZE, 3)
+        self._input = np.empty(input_shape, dtype=np.float32)
+        self._binding = self._session.io_binding()
+        self._binding.bind_output(self._landmarks_name)
+        if self._flag_name is not None:
+            self._binding.bind_output(self._flag_name)
+
+        self._roi = None  # (center_x, center_y, side) in pixels, from the last pose
+        self._static = static_image_mode  # never track: always use the whole frame
+        self._frame_index = 0
+
+    def _roi_transform(self, width, height):
+        """Affine transform mapping the ROI (or the letterboxed frame) to the model input."""
+        if self._static or self._roi is None or self._frame_index % DETECT_EVERY == 0:
+            cx, cy, side = width / 2.0, height / 2.0, float(max(width, height))
+        else:
+            cx, cy, side = self._roi
+        scale = INPUT_SIZE / side
+        return np.array([
+            [scale, 0.0, INPUT_SIZE / 2.0 - cx * scale],
+            [0.0, scale, INPUT_SIZE / 2.0 - cy * scale]
+        ], dtype=np.float32)
+
+    def process(self, rgb_frame):
+        height, width = rgb_frame.shape[:2]
+        transform = self._roi_transform(width, height)
+        self._frame_index += 1
+
+        cv2.warpAffine(rgb_frame, transform, (INPUT_SIZE, INPUT_SIZE), dst=self._warp_buf,
+                       flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
+        if self._nchw:
+            # Scale each channel straight into its plane: no transposed copy
+            for c in range(3):
+                np.multiply(self._warp_buf[:, :, c], 1.0 / 255.0, out=self._input[0, c], casting="unsafe")
+        else:
+            np.multiply(self._warp_buf, 1.0 / 255.0, out=self._input[0], casting="unsafe")
+
+        self._binding.bind_cpu_input(self._input_name, self._input)
+        self._session.run_with_iobinding(self._binding)
+        outputs = dict(zip(
+            [self._landmarks_name] + ([self._flag_name] if self._flag_name else []),
+            self._binding.copy_outputs_to_cpu()
+        ))
+
+        if self._flag_name is not None:
+            flag = float(np.ravel(outputs[self._flag_name])[0])
+            if self._flag_is_logit:
+                flag = float(_sigmoid(flag))
+            if flag < POSE_FLAG_THRESHOLD:
+                self._roi = None
+                return SimpleNamespace(pose_landmarks=None)
+
+        raw = outputs[self._landmarks_name].reshape(-1, VALUES_PER_LANDMARK)[:NUM_LANDMARKS]
+
+        # Map from model input pixels back to normalized frame coordinates
+        scale = transform[0, 0]
+        xs = (raw[:, 0] - transform[0, 2]) / scale
+        ys = (raw[:, 1] - transform[1, 2]) / scale
+        zs = raw[:, 2] / scale / width
+        visibility = _sigmoid(raw[:, 3])
+
+        # Track the ROI for the next frame from this pose's bounding box
+        side = max(xs.max() - xs.min(), ys.max() - ys.min()) * ROI_SCALE
+        self._roi = ((xs.max() + xs.min()) / 2.0, (ys.max() + ys.min()) / 2.0, max(side, 1.0))
+
+        pose_landmarks = landmark_pb2.NormalizedLandmarkList()
+        pose_landmarks.landmark.extend(
+            landmark_pb2.NormalizedLandmark(x=x / width, y=y / height, z=z, visibility=v)
+            for x, y, z, v in zip(xs.tolist(), ys.tolist(), zs.tolist(), visibility.tolist())
+        )
+        return SimpleNamespace(pose_landmarks=pose_landmarks)
+
+    def close(self):
+        self._session = None